@@ -1,11 +1,10 @@
 """Anonymization of PHI-bearing segments (PID, NK1, GT1, IN1, MRG) and non-ASCII transliteration."""
 
-import copy
 import random
 import unicodedata
 
 from .parser import (
-    ParsedMessage, Field, Component, Repetition, split_components,
+    ParsedMessage, Segment, Field, Component, Repetition, split_components,
     reparse_field, rebuild_raw_line,
 )
 
@@ -83,22 +82,27 @@ _ASCII_CITIES = [
 # Utility helpers
 # ---------------------------------------------------------------------------
 
+_DIGITS = "0123456789"
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
 def _randomize_digits(s):
     """Replace each digit with a random digit, preserve everything else."""
-    return "".join(
-        str(random.randint(0, 9)) if ch.isdigit() else ch
-        for ch in s
-    )
+    # One choices() call for the whole string instead of randint per digit
+    fresh = iter(random.choices(_DIGITS, k=len(s)))
+    return "".join(next(fresh) if ch.isdigit() else ch for ch in s)
 
 
 def _randomize_alphanum(s):
     """Replace digits with random digits and letters with random letters."""
+    digits = iter(random.choices(_DIGITS, k=len(s)))
+    letters = iter(random.choices(_LETTERS, k=len(s)))
     out = []
     for ch in s:
         if ch.isdigit():
-            out.append(str(random.randint(0, 9)))
+            out.append(next(digits))
         elif ch.isalpha():
-            repl = chr(random.randint(ord('A'), ord('Z')))
+            repl = next(letters)
             out.append(repl if ch.isupper() else repl.lower())
         else:
             out.append(ch)
@@ -193,13 +197,8 @@ def _generate_fake_phone(raw_value):
     """Anonymize XTN-type field: randomize all digits."""
     if not raw_value:
         return raw_value
-    reps = raw_value.split("~")
-    out_reps = []
-    for rep in reps:
-        parts = rep.split("^")
-        out_parts = [_randomize_digits(p) for p in parts]
-        out_reps.append("^".join(out_parts))
-    return "~".join(out_reps)
+    # Separators are not digits, so one pass covers every rep and component
+    return _randomize_digits(raw_value)
 
 
 # ---------------------------------------------------------------------------
@@ -210,12 +209,88 @@ _rebuild_raw_line = rebuild_raw_line
 _reparse_field = reparse_field
 
 
+def _clone_components(components):
+    return [Component(c.index, c.value, list(c.subcomponents)) for c in components]
+
+
+def _clone_field(fld):
+    reps = [Repetition(r.index, r.value, _clone_components(r.components))
+            for r in fld.repetitions]
+    # The parser shares the first repetition's component list with the field
+    if reps and fld.components is fld.repetitions[0].components:
+        comps = reps[0].components
+    else:
+        comps = _clone_components(fld.components)
+    return Field(fld.field_num, fld.address, fld.value, fld.raw_value, comps, reps)
+
+
+def _clone_message(parsed):
+    """Deep copy of a ParsedMessage; the (immutable) strings are shared.
+
+    Same result as copy.deepcopy, built with direct constructor calls.
+    """
+    result = ParsedMessage(
+        segments=[], version=parsed.version, message_type=parsed.message_type,
+        declared_charset=parsed.declared_charset,
+    )
+    for seg in parsed.segments:
+        clone = Segment(seg.name, seg.rep_index,
+                        [_clone_field(f) for f in seg.fields], seg.raw_line)
+        result.segments.append(clone)
+        result.segments_by_name.setdefault(clone.name, []).append(clone)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Anonymization plan
+# ---------------------------------------------------------------------------
+
+# Replacement generators by kind: (raw_value, name_pool, use_non_ascii) -> raw
+_PHI_FAKERS = {
+    "id": lambda raw, pool, non_ascii: _generate_fake_id(raw),
+    "name": lambda raw, pool, non_ascii: _generate_fake_name(raw, pool),
+    "date": lambda raw, pool, non_ascii: _shift_date(raw),
+    "address": lambda raw, pool, non_ascii: _generate_fake_address(raw, non_ascii),
+    "phone": lambda raw, pool, non_ascii: _generate_fake_phone(raw),
+    "city": lambda raw, pool, non_ascii: _generate_fake_city(non_ascii),
+    "alphanum": lambda raw, pool, non_ascii: _randomize_alphanum(raw),
+    "digits": lambda raw, pool, non_ascii: _randomize_digits(raw),
+}
+
+# PHI-bearing fields per segment. Empty fields are left alone.
+_PHI_FIELDS = {
+    # PID-2/3/18/21: IDs (CX), PID-5/6/9: names (XPN), PID-7: birth date,
+    # PID-11: address (XAD), PID-13/14: phones (XTN), PID-19/20: SSN and
+    # driver's license, PID-23: birth place
+    "PID": {2: "id", 3: "id", 5: "name", 6: "name", 7: "date", 9: "name",
+            11: "address", 13: "phone", 14: "phone", 18: "id",
+            19: "alphanum", 20: "alphanum", 21: "id", 23: "city"},
+    # NK1-2: name (XPN), NK1-4: address (XAD),
+    # NK1-5: phone (XTN), NK1-6: business phone (XTN)
+    "NK1": {2: "name", 4: "address", 5: "phone", 6: "phone"},
+    # GT1-3: name (XPN), GT1-5: address (XAD),
+    # GT1-6/7: phone (XTN), GT1-8: date (TS), GT1-12: SSN
+    "GT1": {3: "name", 5: "address", 6: "phone", 7: "phone", 8: "date",
+            12: "digits"},
+    # IN1-16: name (XPN), IN1-18: date (TS), IN1-19: address (XAD)
+    "IN1": {16: "name", 18: "date", 19: "address"},
+    # MRG-1..4: prior IDs (CX), MRG-7: prior name (XPN)
+    "MRG": {1: "id", 2: "id", 3: "id", 4: "id", 7: "name"},
+}
+
+# Segment -> ((field_num, faker), ...) in field order
+_PHI_PLAN = {
+    seg_name: tuple((num, _PHI_FAKERS[kind]) for num, kind in sorted(fields.items()))
+    for seg_name, fields in _PHI_FIELDS.items()
+}
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 def anonymize_message(parsed, use_non_ascii=False):
-    """Deep-copy parsed message, anonymize PHI-bearing segments, rebuild raw_lines.
+    """Copy parsed message, anonymize PHI-bearing segments, rebuild raw_lines.
 
     Processes PID, NK1, GT1, IN1, and MRG segments.
 
@@ -226,140 +301,84 @@ def anonymize_message(parsed, use_non_ascii=False):
     Returns:
         A new ParsedMessage with PHI fields anonymized.
     """
-    result = copy.deepcopy(parsed)
+    result = _clone_message(parsed)
     pool = ESTONIAN_NAMES if use_non_ascii else ASCII_NAMES
 
     for seg in result.segments:
-        if seg.name == "PID":
-            for fld in seg.fields:
-                new_raw = None
-                if fld.field_num in (2, 3):
-                    new_raw = _generate_fake_id(fld.raw_value)
-                elif fld.field_num in (5, 6, 9):
-                    new_raw = _generate_fake_name(fld.raw_value, pool)
-                elif fld.field_num == 7:
-                    new_raw = _shift_date(fld.raw_value)
-                elif fld.field_num == 11:
-                    new_raw = _generate_fake_address(fld.raw_value, use_non_ascii)
-                elif fld.field_num in (13, 14):
-                    new_raw = _generate_fake_phone(fld.raw_value)
-                elif fld.field_num in (18, 21):
-                    new_raw = _generate_fake_id(fld.raw_value)
-                elif fld.field_num in (19, 20):
-                    new_raw = _randomize_alphanum(fld.raw_value) if fld.raw_value else None
-                elif fld.field_num == 23:
-                    new_raw = _generate_fake_city(use_non_ascii) if fld.raw_value else None
-                if new_raw is not None:
-                    _reparse_field(fld, new_raw)
-            seg.raw_line = _rebuild_raw_line(seg.name, seg.fields)
-
-        elif seg.name == "NK1":
-            # NK1-2: name (XPN), NK1-4: address (XAD),
-            # NK1-5: phone (XTN), NK1-6: business phone (XTN)
-            for fld in seg.fields:
-                new_raw = None
-                if fld.field_num == 2:
-                    new_raw = _generate_fake_name(fld.raw_value, pool)
-                elif fld.field_num == 4:
-                    new_raw = _generate_fake_address(fld.raw_value, use_non_ascii)
-                elif fld.field_num in (5, 6):
-                    new_raw = _generate_fake_phone(fld.raw_value)
-                if new_raw is not None:
-                    _reparse_field(fld, new_raw)
-            seg.raw_line = _rebuild_raw_line(seg.name, seg.fields)
-
-        elif seg.name == "GT1":
-            # GT1-3: name (XPN), GT1-5: address (XAD),
-            # GT1-6/7: phone (XTN), GT1-8: date (TS), GT1-12: SSN
-            for fld in seg.fields:
-                new_raw = None
-                if fld.field_num == 3:
-                    new_raw = _generate_fake_name(fld.raw_value, pool)
-                elif fld.field_num == 5:
-                    new_raw = _generate_fake_address(fld.raw_value, use_non_ascii)
-                elif fld.field_num in (6, 7):
-                    new_raw = _generate_fake_phone(fld.raw_value)
-                elif fld.field_num == 8:
-                    new_raw = _shift_date(fld.raw_value)
-                elif fld.field_num == 12:
-                    new_raw = _randomize_digits(fld.raw_value) if fld.raw_value else None
-                if new_raw is not None:
-                    _reparse_field(fld, new_raw)
-            seg.raw_line = _rebuild_raw_line(seg.name, seg.fields)
-
-        elif seg.name == "IN1":
-            # IN1-16: name (XPN), IN1-18: date (TS), IN1-19: address (XAD)
-            for fld in seg.fields:
-                new_raw = None
-                if fld.field_num == 16:
-                    new_raw = _generate_fake_name(fld.raw_value, pool)
-                elif fld.field_num == 18:
-                    new_raw = _shift_date(fld.raw_value)
-                elif fld.field_num == 19:
-                    new_raw = _generate_fake_address(fld.raw_value, use_non_ascii)
-                if new_raw is not None:
-                    _reparse_field(fld, new_raw)
-            seg.raw_line = _rebuild_raw_line(seg.name, seg.fields)
-
-        elif seg.name == "MRG":
-            # MRG-1..4: prior IDs (CX), MRG-7: prior name (XPN)
-            for fld in seg.fields:
-                new_raw = None
-                if fld.field_num in (1, 2, 3, 4):
-                    new_raw = _generate_fake_id(fld.raw_value)
-                elif fld.field_num == 7:
-                    new_raw = _generate_fake_name(fld.raw_value, pool)
-                if new_raw is not None:
-                    _reparse_field(fld, new_raw)
-            seg.raw_line = _rebuild_raw_line(seg.name, seg.fields)
+        plan = _PHI_PLAN.get(seg.name)
+        if plan is None:
+            continue
+        for field_num, fake in plan:
+            fld = seg.fields_by_num.get(field_num)
+            if fld is not None and fld.raw_value:
+                _reparse_field(fld, fake(fld.raw_value, pool, use_non_ascii))
+        seg.raw_line = _rebuild_raw_line(seg.name, seg.fields)
 
     return result
 
 
+# Manual mapping for common chars that NFKD doesn't handle well
+_TRANSLIT_EXTRA = {
+    "\u00d0": "D",   # Ð
+    "\u00f0": "d",   # ð
+    "\u00de": "Th",  # Þ
+    "\u00fe": "th",  # þ
+    "\u00df": "ss",  # ß
+    "\u00c6": "AE",  # Æ
+    "\u00e6": "ae",  # æ
+    "\u0152": "OE",  # Œ
+    "\u0153": "oe",  # œ
+    "\u0160": "S",   # Š
+    "\u0161": "s",   # š
+    "\u017d": "Z",   # Ž
+    "\u017e": "z",   # ž
+    "\u00d8": "O",   # Ø
+    "\u00f8": "o",   # ø
+    "\u0110": "D",   # Đ
+    "\u0111": "d",   # đ
+    "\u0126": "H",   # Ħ
+    "\u0127": "h",   # ħ
+    "\u0131": "i",   # ı
+    "\u0141": "L",   # Ł
+    "\u0142": "l",   # ł
+    "\u014a": "N",   # Ŋ
+    "\u014b": "n",   # ŋ
+    "\u0166": "T",   # Ŧ
+    "\u0167": "t",   # ŧ
+}
+
+
+class _TranslitTable(dict):
+    """str.translate table that fills in each code point on first use."""
+
+    def __missing__(self, cp):
+        ch = chr(cp)
+        if cp < 128:
+            result = ch
+        elif ch in _TRANSLIT_EXTRA:
+            result = _TRANSLIT_EXTRA[ch]
+        else:
+            # NFKD decomposition: strip combining marks
+            decomposed = unicodedata.normalize("NFKD", ch)
+            result = "".join(c for c in decomposed if ord(c) < 128) or "?"
+        self[cp] = result
+        return result
+
+
+_TRANSLIT_TABLE = _TranslitTable()
+# Pre-fill Latin-1 and Latin Extended-A (covers the Estonian name pool) so
+# typical names translate without dropping into __missing__.
+for _cp in range(0x80, 0x180):
+    _TRANSLIT_TABLE[_cp]
+del _cp
+
+
 def transliterate(text):
     """Replace non-ASCII characters with closest ASCII equivalents.
 
     Uses Unicode NFKD decomposition to strip combining marks, with
     manual fallbacks for characters that don't decompose cleanly.
     """
-    if not text:
+    if not text or text.isascii():
         return text
-
-    # Check fast path: all ASCII
-    try:
-        text.encode("ascii")
-        return text
-    except UnicodeEncodeError:
-        pass
-
-    # Manual mapping for common chars that NFKD doesn't handle well
-    _EXTRA = {
-        "\u00d0": "D",   # Ð
-        "\u00f0": "d",   # ð
-        "\u00de": "Th",  # Þ
-        "\u00fe": "th",  # þ
-        "\u00df": "ss",  # ß
-        "\u00c6": "AE",  # Æ
-        "\u00e6": "ae",  # æ
-        "\u0152": "OE",  # Œ
-        "\u0153": "oe",  # œ
-        "\u0160": "S",   # Š
-        "\u0161": "s",   # š
-        "\u017d": "Z",   # Ž
-        "\u017e": "z",   # ž
-    }
-
-    out = []
-    for ch in text:
-        if ord(ch) < 128:
-            out.append(ch)
-            continue
-        if ch in _EXTRA:
-            out.append(_EXTRA[ch])
-            continue
-        # NFKD decomposition: strip combining marks
-        decomposed = unicodedata.normalize("NFKD", ch)
-        ascii_chars = "".join(c for c in decomposed if ord(c) < 128)
-        out.append(ascii_chars if ascii_chars else "?")
-
-    return "".join(out)
+    return text.translate(_TRANSLIT_TABLE)
@@ -11,7 +11,7 @@ from .encoding import detect_encoding
 from .definitions import resolve_version, MSH18_TO_ENCODING
 from .formatter import format_diff, format_encoding_header, format_field_value, format_message, format_raw
 from .mllp import mllp_send, reconstruct_message
-from .parser import parse_hl7
+from .parser import normalize_message, parse_hl7, parse_segments, split_segments
 from .profile import load_profile
 
 
@@ -179,11 +179,10 @@ def _parse_host_port(target):
 
 def _get_ack_code(parsed):
     """Extract MSA-1 acknowledgment code from a parsed response."""
-    for seg in parsed.segments:
-        if seg.name == 'MSA':
-            for fld in seg.fields:
-                if fld.field_num == 1:
-                    return fld.value
+    for seg in parsed.segments_by_name.get('MSA', ()):
+        fld = seg.fields_by_num.get(1)
+        if fld:
+            return fld.value
     return None
 
 
@@ -340,7 +339,18 @@ def main():
                 except (OSError, IOError) as e:
                     print(f'Error reading {path}: {e}', file=sys.stderr)
                     continue
-                parsed = parse_hl7(text)
+                # Normalize once; both the batch split and the parse use it
+                lines = normalize_message(text)
+                batch = split_segments(lines)
+                if len(batch) > 1:
+                    # One history entry per message; the TUI parses each
+                    # one when it is first shown
+                    name = os.path.basename(path)
+                    for i, msg_lines in enumerate(batch, 1):
+                        messages.append(('\r'.join(msg_lines),
+                                         f'{name} [{i}/{len(batch)}]', enc_info))
+                    continue
+                parsed = parse_segments(lines)
                 if parsed:
                     messages.append((parsed, os.path.basename(path), enc_info))
                 else:
@@ -349,6 +359,8 @@ def main():
                 print('Error: no valid HL7 messages found', file=sys.stderr)
                 sys.exit(1)
             first_parsed, first_name, first_enc = messages[0]
+            if isinstance(first_parsed, str):
+                first_parsed = parse_hl7(first_parsed)
             _launch_tui_with_messages(first_parsed, first_enc, args,
                                       filename=first_name,
                                       extra_messages=messages[1:])
@@ -1,6 +1,6 @@
 """HL7 v2.3, v2.5, and v2.8 segment/field definitions and data types."""
 
-import copy
+import functools
 
 # ========== DATA TYPES ==========
 
@@ -194,6 +194,15 @@ def _f(name, dt, opt="O", rep=False, length=0):
     return {"name": name, "dt": dt, "opt": opt, "rep": rep, "len": length}
 
 
+def _derive(defs):
+    """Copy a version table for patching.
+
+    Segment and field maps are copied; the field definitions themselves are
+    shared, since later versions replace them rather than edit them.
+    """
+    return {name: {**seg, "fields": dict(seg["fields"])} for name, seg in defs.items()}
+
+
 HL7_V23 = {
     "MSH": {"name": "Message Header", "fields": {
         1: _f("Field Separator", "ST", "R", False, 1),
@@ -618,7 +627,7 @@ HL7_V23 = {
 # ========== HL7 v2.5 SEGMENT DEFINITIONS ==========
 # Start with v2.3 as base, then override/extend
 
-HL7_V25 = copy.deepcopy(HL7_V23)
+HL7_V25 = _derive(HL7_V23)
 
 # MSH v2.5 extensions
 HL7_V25["MSH"]["fields"][20] = _f("Alternate Character Set Handling", "ID", "O", False, 20)
@@ -1058,7 +1067,7 @@ HL7_V25["ACC"] = {"name": "Accident", "fields": {
 # ========== HL7 v2.8 SEGMENT DEFINITIONS ==========
 # Start with v2.5 as base, then override/extend
 
-HL7_V28 = copy.deepcopy(HL7_V25)
+HL7_V28 = _derive(HL7_V25)
 
 # MSH v2.8 extensions
 HL7_V28["MSH"]["fields"][22] = _f("Sending Responsible Organization", "XON", "O", False, 567)
@@ -1122,8 +1131,9 @@ MSH18_TO_ENCODING = {
 
 # ========== ACCESSOR FUNCTIONS ==========
 
+@functools.lru_cache(maxsize=64)
 def resolve_version(version_string):
-    """Map HL7 version string to a supported definition set."""
+    """Map HL7 version string to a supported definition set (cached)."""
     if not version_string:
         return "2.5"
     v = version_string.strip()
@@ -1138,15 +1148,32 @@ def resolve_version(version_string):
     return "2.5"
 
 
+# Segment names come from the message, so the caches are bounded. Results
+# are the shared definition objects: copy before mutating.
+@functools.lru_cache(maxsize=4096)
 def get_seg_def(seg_name, version):
-    """Get segment definition dict or None."""
+    """Get segment definition dict or None (cached; definitions are static)."""
     defs = HL7_DEFS.get(version)
     return defs.get(seg_name) if defs else None
 
 
+@functools.lru_cache(maxsize=4096)
 def get_field_def(seg_name, field_num, version):
-    """Get field definition dict or None."""
+    """Get field definition dict or None (cached; definitions are static)."""
     seg = get_seg_def(seg_name, version)
     if not seg or "fields" not in seg:
         return None
     return seg["fields"].get(field_num)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_field_defs(seg_name, version):
+    """Field definitions of a segment as a tuple indexed by field number.
+
+    Gaps (and index 0) are None. Returns () for unknown segments.
+    """
+    seg = get_seg_def(seg_name, version)
+    if not seg or not seg.get("fields"):
+        return ()
+    fields = seg["fields"]
+    return tuple(fields.get(n) for n in range(max(fields) + 1))
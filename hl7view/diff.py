@@ -3,7 +3,7 @@
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldDiff:
     """Difference record for a single field."""
     address: str
@@ -15,7 +15,7 @@ class FieldDiff:
     field_b: object = None  # Field dataclass from B (or None)
 
 
-@dataclass
+@dataclass(slots=True)
 class SegmentDiff:
     """Difference record for a segment (by name + rep_index)."""
     name: str
@@ -24,7 +24,7 @@ class SegmentDiff:
     field_diffs: list    # list of FieldDiff
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageDiff:
     """Top-level diff result between two messages."""
     segment_diffs: list  # list of SegmentDiff
@@ -40,11 +40,6 @@ def _seg_key(seg):
     return (seg.name, seg.rep_index)
 
 
-def _build_field_map(seg):
-    """Build {field_num: field} dict for a segment."""
-    return {f.field_num: f for f in seg.fields}
-
-
 def diff_messages(parsed_a, parsed_b):
     """Compare two ParsedMessage objects field-by-field.
 
@@ -119,10 +114,28 @@ def diff_messages(parsed_a, parsed_b):
                 status='b_only', field_diffs=field_diffs,
             ))
 
+        elif seg_a is seg_b:
+            # Same segment object on both sides (a message diffed against
+            # itself, or a copy that shares it): nothing to compare
+            field_diffs = []
+            for fnum, fld in sorted(seg_a.fields_by_num.items()):
+                field_diffs.append(FieldDiff(
+                    address=_make_address(seg_name, rep_idx, fnum),
+                    field_num=fnum, status='identical',
+                    value_a=fld.raw_value, value_b=fld.raw_value,
+                    field_a=fld, field_b=fld,
+                ))
+            counts['identical'] += len(field_diffs)
+            counts['total_fields'] += len(field_diffs)
+            segment_diffs.append(SegmentDiff(
+                name=seg_name, rep_index=rep_idx,
+                status='identical', field_diffs=field_diffs,
+            ))
+
         else:
             # Segment in both — compare fields
-            fields_a = _build_field_map(seg_a)
-            fields_b = _build_field_map(seg_b)
+            fields_a = seg_a.fields_by_num
+            fields_b = seg_b.fields_by_num
             all_fnums = sorted(set(fields_a.keys()) | set(fields_b.keys()))
 
             field_diffs = []
@@ -23,17 +23,37 @@ def detect_encoding(raw_bytes):
         return {"encoding": "UTF-16 BE", "decoder_label": "utf-16-be",
                 "has_bom": True, "has_high_bytes": True}
 
-    # No BOM: scan bytes for UTF-8 validity
-    has_high = False
-    valid_utf8 = True
-    has_multibyte = False
+    # No BOM: the C-level ASCII check and strict decode settle the common
+    # cases; only bytes CPython rejects go through the lenient scan below.
+    if b.isascii():
+        return {"encoding": "ASCII", "decoder_label": "utf-8",
+                "has_bom": False, "has_high_bytes": False}
+    try:
+        b.decode("utf-8")
+        valid_utf8 = True
+    except UnicodeDecodeError:
+        valid_utf8 = _scan_utf8(b)
+
+    if valid_utf8:
+        return {"encoding": "UTF-8", "decoder_label": "utf-8",
+                "has_bom": False, "has_high_bytes": True}
+    # Invalid UTF-8 with high bytes -> ISO-8859-1
+    return {"encoding": "ISO-8859-1", "decoder_label": "iso-8859-1",
+            "has_bom": False, "has_high_bytes": True}
+
+
+def _scan_utf8(b):
+    """Check UTF-8 sequence structure (lead byte + continuation bytes).
+
+    Looser than the codec: overlong forms and surrogates still count as
+    UTF-8, which is what detect_encoding has always reported for them.
+    """
     i = 0
     while i < len(b):
         byte = b[i]
         if byte < 0x80:
             i += 1
             continue
-        has_high = True
         # Check UTF-8 multi-byte sequence
         if (byte & 0xE0) == 0xC0:
             seq_len = 2
@@ -42,26 +62,11 @@ def detect_encoding(raw_bytes):
         elif (byte & 0xF8) == 0xF0:
             seq_len = 4
         else:
-            valid_utf8 = False
-            break
+            return False
         if i + seq_len > len(b):
-            valid_utf8 = False
-            break
+            return False
         for j in range(1, seq_len):
             if (b[i + j] & 0xC0) != 0x80:
-                valid_utf8 = False
-                break
-        if not valid_utf8:
-            break
-        has_multibyte = True
+                return False
         i += seq_len
-
-    if not has_high:
-        return {"encoding": "ASCII", "decoder_label": "utf-8",
-                "has_bom": False, "has_high_bytes": False}
-    if valid_utf8 and has_multibyte:
-        return {"encoding": "UTF-8", "decoder_label": "utf-8",
-                "has_bom": False, "has_high_bytes": True}
-    # Invalid UTF-8 with high bytes -> ISO-8859-1
-    return {"encoding": "ISO-8859-1", "decoder_label": "iso-8859-1",
-            "has_bom": False, "has_high_bytes": True}
+    return True
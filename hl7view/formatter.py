@@ -84,15 +84,12 @@ def _profile_validation_counts(parsed, profile):
             continue
         if not seg_def.get("fields"):
             continue
-        for seg in parsed.segments:
-            if seg.name != seg_name:
-                continue
+        for seg in parsed.segments_by_name.get(seg_name, ()):
             for field_num, p_fld in seg_def["fields"].items():
-                fld = None
-                for f in seg.fields:
-                    if f.field_num == int(field_num):
-                        fld = f
-                        break
+                try:
+                    fld = seg.fields_by_num.get(int(field_num))
+                except ValueError:
+                    continue
                 req, mis = _check_field_validation(p_fld, fld)
                 if req:
                     required_empty += 1
@@ -510,14 +507,12 @@ def format_field_value(parsed, field_spec, version=None):
     rep_idx = int(match.group(2)) if match.group(2) else None
     field_num = int(match.group(3))
 
-    for seg in parsed.segments:
-        if seg.name != seg_name:
-            continue
+    for seg in parsed.segments_by_name.get(seg_name, ()):
         if rep_idx is not None and seg.rep_index != rep_idx:
             continue
-        for fld in seg.fields:
-            if fld.field_num == field_num:
-                return fld.raw_value
+        fld = seg.fields_by_num.get(field_num)
+        if fld:
+            return fld.raw_value
     return None
 
 
@@ -263,41 +263,40 @@ def hl7_get_field(message: str, address: str) -> str:
     field_num = int(addr_match.group(3))
 
     # Find the field
-    for seg in parsed.segments:
-        if seg.name != seg_name:
-            continue
+    for seg in parsed.segments_by_name.get(seg_name, ()):
         if rep_idx is not None and seg.rep_index != rep_idx:
             continue
-        for fld in seg.fields:
-            if fld.field_num == field_num:
-                if comp_index is not None:
-                    # Return specific component
-                    fld_def = get_field_def(seg_name, field_num, version)
-                    dt = fld_def["dt"] if fld_def else None
-                    dt_info = DATA_TYPES.get(dt, {}) if dt else {}
-                    comp_defs = dt_info.get("components", [])
-
-                    comp_value = None
-                    comp_name = None
-                    if fld.components and comp_index <= len(fld.components):
-                        comp_value = fld.components[comp_index - 1].value
-                    elif not fld.components and comp_index == 1:
-                        comp_value = fld.value
-
-                    if comp_index <= len(comp_defs):
-                        comp_name = comp_defs[comp_index - 1]["name"]
-
-                    result = {
-                        "address": f"{base_address}.{comp_index}",
-                        "value": comp_value,
-                    }
-                    if comp_name:
-                        result["name"] = comp_name
-                    return json.dumps(result, ensure_ascii=False)
-
-                # Return full field
-                fd = _field_to_dict(fld, seg_name, version, show_empty=True)
-                return json.dumps(fd, ensure_ascii=False)
+        fld = seg.fields_by_num.get(field_num)
+        if fld is None:
+            continue
+        if comp_index is not None:
+            # Return specific component
+            fld_def = get_field_def(seg_name, field_num, version)
+            dt = fld_def["dt"] if fld_def else None
+            dt_info = DATA_TYPES.get(dt, {}) if dt else {}
+            comp_defs = dt_info.get("components", [])
+
+            comp_value = None
+            comp_name = None
+            if fld.components and comp_index <= len(fld.components):
+                comp_value = fld.components[comp_index - 1].value
+            elif not fld.components and comp_index == 1:
+                comp_value = fld.value
+
+            if comp_index <= len(comp_defs):
+                comp_name = comp_defs[comp_index - 1]["name"]
+
+            result = {
+                "address": f"{base_address}.{comp_index}",
+                "value": comp_value,
+            }
+            if comp_name:
+                result["name"] = comp_name
+            return json.dumps(result, ensure_ascii=False)
+
+        # Return full field
+        fd = _field_to_dict(fld, seg_name, version, show_empty=True)
+        return json.dumps(fd, ensure_ascii=False)
 
     return json.dumps({"error": f"Field {address} not found in message"})
 
@@ -361,12 +360,8 @@ def hl7_validate(message: str, profile: str = "") -> str:
         for fnum, fdef in seg_def.get("fields", {}).items():
             if fdef["opt"] != "R":
                 continue
-            found = False
-            for fld in seg.fields:
-                if fld.field_num == fnum and fld.raw_value:
-                    found = True
-                    break
-            if not found:
+            fld = seg.fields_by_num.get(fnum)
+            if not (fld and fld.raw_value):
                 addr = f"{seg.name}-{fnum}"
                 if seg.rep_index > 1:
                     addr = f"{seg.name}[{seg.rep_index}]-{fnum}"
@@ -382,7 +377,7 @@ def hl7_validate(message: str, profile: str = "") -> str:
             if "fields" not in seg_prof:
                 continue
             # Find matching segments in message
-            matching_segs = [s for s in parsed.segments if s.name == seg_name_p]
+            matching_segs = parsed.segments_by_name.get(seg_name_p, [])
             if not matching_segs:
                 if seg_prof.get("custom"):
                     # Custom/Z-segments: only info-level
@@ -412,11 +407,8 @@ def hl7_validate(message: str, profile: str = "") -> str:
                         addr = f"{seg.name}[{seg.rep_index}]-{fnum}"
 
                     # Find field value in this segment
-                    fld_value = None
-                    for fld in seg.fields:
-                        if fld.field_num == fnum:
-                            fld_value = fld.raw_value
-                            break
+                    fld = seg.fields_by_num.get(fnum)
+                    fld_value = fld.raw_value if fld else None
 
                     display_name = fprof.get("customName", addr)
 
@@ -521,17 +513,14 @@ def hl7_transform(message: str, changes: dict[str, str]) -> str:
         field_num = int(addr_match.group(3))
 
         found = False
-        for seg in parsed.segments:
-            if seg.name != seg_name:
-                continue
+        for seg in parsed.segments_by_name.get(seg_name, ()):
             if rep_idx is not None and seg.rep_index != rep_idx:
                 continue
 
-            for fld in seg.fields:
-                if fld.field_num == field_num:
-                    reparse_field(fld, new_value)
-                    found = True
-                    break
+            fld = seg.fields_by_num.get(field_num)
+            if fld:
+                reparse_field(fld, new_value)
+                found = True
 
             if found:
                 seg.raw_line = rebuild_raw_line(seg.name, seg.fields)
@@ -1,6 +1,9 @@
 """MLLP (Minimal Lower Layer Protocol) transport for HL7 messages."""
 
+import collections
+import selectors
 import socket
+import threading
 import time
 
 MLLP_VT = b'\x0b'
@@ -13,10 +16,196 @@ def reconstruct_message(parsed) -> str:
     return '\r'.join(seg.raw_line for seg in parsed.segments) + '\r'
 
 
+class MllpClient:
+    """MLLP connection that is kept open and reused across sends.
+
+    Connects lazily on the first send and reconnects after any error, so a
+    series of messages to one endpoint pays the TCP/TLS handshake once.
+    Sends are serialized, so one client can be shared between threads.
+
+    Replies arrive in send order. A send with wait_for_ack=False still owes
+    a reply; the next waiting send skips that many frames before returning
+    its own, so it blocks until the peer has acknowledged the earlier ones.
+    """
+
+    def __init__(self, host, port, timeout=10, tls_config=None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.tls_config = tls_config
+        self._sock = None
+        self._buf = bytearray()
+        self._unacked = 0   # replies still owed for wait_for_ack=False sends
+        self._lock = threading.Lock()
+        self._retry_errors = (BlockingIOError, InterruptedError)
+        if tls_config:
+            import ssl
+            self._retry_errors += (ssl.SSLWantReadError,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the underlying socket, if open."""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._buf.clear()
+        self._unacked = 0
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        tls_config = self.tls_config
+        try:
+            if tls_config:
+                import ssl
+                if tls_config.get("insecure"):
+                    ctx = ssl.create_default_context()
+                    ctx.check_hostname = False
+                    ctx.verify_mode = ssl.CERT_NONE
+                elif tls_config.get("ca_cert"):
+                    ctx = ssl.create_default_context(cafile=tls_config["ca_cert"])
+                else:
+                    ctx = ssl.create_default_context()
+                if tls_config.get("client_cert"):
+                    ctx.load_cert_chain(
+                        certfile=tls_config["client_cert"],
+                        keyfile=tls_config.get("client_key"),
+                    )
+                sock = ctx.wrap_socket(sock, server_hostname=self.host)
+            sock.connect((self.host, self.port))
+        except BaseException:
+            sock.close()
+            raise
+        self._sock = sock
+        self._buf.clear()
+        self._unacked = 0
+
+    def _fill_until_fs(self):
+        """Read into the buffer until it holds an FS byte. False on EOF."""
+        sock = self._sock
+        # select() bounds the total wait so a response split across
+        # segments can't stretch past the timeout
+        deadline = time.monotonic() + self.timeout
+        sock.setblocking(False)
+        try:
+            with selectors.DefaultSelector() as sel:
+                sel.register(sock, selectors.EVENT_READ)
+                while MLLP_FS[0] not in self._buf:
+                    # TLS may hold decrypted bytes the selector can't see
+                    if not (self.tls_config and sock.pending()):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not sel.select(remaining):
+                            raise TimeoutError(f'No response within {self.timeout}s')
+                    try:
+                        chunk = sock.recv(16384)
+                    except self._retry_errors:
+                        continue
+                    if not chunk:
+                        return False
+                    self._buf.extend(chunk)
+        finally:
+            sock.settimeout(self.timeout)
+        return True
+
+    def _read_frame(self):
+        """Return the next MLLP frame payload (bytes) from the connection."""
+        alive = self._fill_until_fs()
+        data, _, rest = bytes(self._buf).partition(MLLP_FS)
+        self._buf[:] = rest.lstrip(MLLP_CR)
+        if not alive:
+            self._close()
+        # Strip MLLP framing: VT at start (after any CR left from the last frame)
+        data = data.lstrip(MLLP_CR)
+        if data.startswith(MLLP_VT):
+            data = data[1:]
+        return data
+
+    def _still_open(self):
+        """Drain any bytes already waiting; False if the peer has closed."""
+        sock = self._sock
+        sock.setblocking(False)
+        try:
+            while True:
+                try:
+                    chunk = sock.recv(16384)
+                except self._retry_errors:
+                    return True
+                if not chunk:
+                    return False
+                self._buf.extend(chunk)
+        except OSError:
+            return False
+        finally:
+            sock.settimeout(self.timeout)
+
+    def _discard_stale(self):
+        """Drop buffered replies to earlier no-wait sends, and anything unsolicited."""
+        while self._unacked and MLLP_FS[0] in self._buf:
+            _, _, rest = bytes(self._buf).partition(MLLP_FS)
+            self._buf[:] = rest.lstrip(MLLP_CR)
+            self._unacked -= 1
+        if not self._unacked:
+            # Nothing is owed, so these bytes must not pass for the next reply
+            self._buf.clear()
+
+    def send(self, message_text, wait_for_ack=True):
+        """Send one MLLP-framed message on the shared connection.
+
+        Returns:
+            (response_text: str|None, elapsed_ms: int)
+        """
+        payload = MLLP_VT + message_text.encode('utf-8') + MLLP_FS + MLLP_CR
+        with self._lock:
+            return self._send(payload, wait_for_ack)
+
+    def _send(self, payload, wait_for_ack):
+        start = time.monotonic()
+        # Peer may have dropped an idle connection since the last send
+        if self._sock is not None and not self._still_open():
+            self._close()
+        if self._sock is None:
+            self._connect()
+        self._discard_stale()
+        try:
+            self._sock.sendall(payload)
+
+            if not wait_for_ack:
+                self._unacked += 1
+                elapsed_ms = int((time.monotonic() - start) * 1000)
+                return None, elapsed_ms
+
+            while self._unacked:
+                self._read_frame()
+                if self._sock is None:
+                    raise ConnectionError(
+                        f'{self.host}:{self.port} closed the connection before replying')
+                self._unacked -= 1
+            data = self._read_frame()
+        except BaseException:
+            self._close()
+            raise
+
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        return data.decode('utf-8', errors='replace'), elapsed_ms
+
+
 def mllp_send(host, port, message_text, timeout=10, wait_for_ack=True,
               tls_config=None):
     """Send MLLP-framed HL7 message and optionally wait for response.
 
+    Opens and closes a fresh connection per call. Callers that send
+    several messages to one endpoint can hold an MllpClientPool instead,
+    which reuses connections and closes idle ones; close() it when done.
+
     Args:
         host: Target hostname or IP
         port: Target port number
@@ -35,55 +224,60 @@ def mllp_send(host, port, message_text, timeout=10, wait_for_ack=True,
     Raises:
         ConnectionError, TimeoutError, OSError, ssl.SSLError
     """
-    payload = MLLP_VT + message_text.encode('utf-8') + MLLP_FS + MLLP_CR
+    with MllpClient(host, port, timeout=timeout, tls_config=tls_config) as client:
+        return client.send(message_text, wait_for_ack=wait_for_ack)
 
-    start = time.monotonic()
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(timeout)
-    try:
-        if tls_config:
-            import ssl
-            if tls_config.get("insecure"):
-                ctx = ssl.create_default_context()
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-            elif tls_config.get("ca_cert"):
-                ctx = ssl.create_default_context(cafile=tls_config["ca_cert"])
-            else:
-                ctx = ssl.create_default_context()
-            if tls_config.get("client_cert"):
-                ctx.load_cert_chain(
-                    certfile=tls_config["client_cert"],
-                    keyfile=tls_config.get("client_key"),
-                )
-            sock = ctx.wrap_socket(sock, server_hostname=host)
-        sock.connect((host, port))
-        sock.sendall(payload)
-
-        if not wait_for_ack:
-            elapsed_ms = int((time.monotonic() - start) * 1000)
-            return None, elapsed_ms
-
-        # Read until we see FS byte
-        buf = bytearray()
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            buf.extend(chunk)
-            if MLLP_FS[0] in buf:
-                break
 
-        elapsed_ms = int((time.monotonic() - start) * 1000)
+class MllpClientPool:
+    """Reusable MllpClient per (host, port, timeout, TLS settings).
 
-        # Strip MLLP framing: VT at start, FS+CR at end
-        data = bytes(buf)
-        if data.startswith(MLLP_VT):
-            data = data[1:]
-        fs_pos = data.find(MLLP_FS)
-        if fs_pos >= 0:
-            data = data[:fs_pos]
+    send() takes the same arguments as mllp_send, so callers that send
+    repeatedly can swap one for the other. A connection left unused for
+    idle_timeout seconds is closed and reopened on its next send, since
+    NATs and firewalls drop idle TCP sessions without telling either end.
+    At most max_clients connections stay open; the least recently used
+    one is closed to make room. Call close() when done with the pool.
+    """
 
-        return data.decode('utf-8', errors='replace'), elapsed_ms
-    finally:
-        sock.close()
+    def __init__(self, idle_timeout=60, max_clients=8):
+        self.idle_timeout = idle_timeout
+        self.max_clients = max_clients
+        self._clients = collections.OrderedDict()  # key -> (client, last_used)
+        self._lock = threading.Lock()
+
+    def send(self, host, port, message_text, timeout=10, wait_for_ack=True,
+             tls_config=None):
+        """Send through the pooled client for this target; see mllp_send."""
+        tls_key = tuple(sorted(tls_config.items())) if tls_config else None
+        key = (host, port, timeout, tls_key)
+        stale = []
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None and time.monotonic() - entry[1] > self.idle_timeout:
+                stale.append(entry[0])
+                entry = None
+            if entry is None:
+                client = MllpClient(host, port, timeout=timeout,
+                                    tls_config=tls_config)
+            else:
+                client = entry[0]
+            self._clients[key] = (client, time.monotonic())
+            while len(self._clients) > self.max_clients:
+                stale.append(self._clients.popitem(last=False)[1][0])
+        # Close outside the pool lock; a client may be mid-send on another thread
+        for old in stale:
+            old.close()
+        try:
+            return client.send(message_text, wait_for_ack=wait_for_ack)
+        finally:
+            with self._lock:
+                if self._clients.get(key, (None,))[0] is client:
+                    self._clients[key] = (client, time.monotonic())
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            client.close()
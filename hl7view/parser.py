@@ -1,24 +1,29 @@
 """HL7 message parsing: normalization, segment splitting, field/component extraction."""
 
+# NOTE: Do not wrap functions here with numba.jit. HL7 parsing is dominated
+# by short-string split/find, which Numba only handles in object mode and
+# is consistently slower than CPython. Keep this module pure Python.
+
 import re
+import sys
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     index: int          # 1-based
     value: str
     subcomponents: list
 
 
-@dataclass
+@dataclass(slots=True)
 class Repetition:
     index: int          # 1-based
     value: str
     components: list    # list of Component
 
 
-@dataclass
+@dataclass(slots=True)
 class Field:
     field_num: int
     address: str        # "PID-3", "MSH-9", "PID[2]-3"
@@ -28,20 +33,36 @@ class Field:
     repetitions: list   # list of Repetition
 
 
-@dataclass
+@dataclass(slots=True)
 class Segment:
     name: str
     rep_index: int      # 1 for first occurrence, 2 for second, etc.
     fields: list        # list of Field
     raw_line: str
+    # field_num -> Field; built from fields, which are edited in place
+    fields_by_num: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.fields_by_num = {f.field_num: f for f in self.fields}
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedMessage:
     segments: list                        # list of Segment
     version: str = None                   # from MSH-12
     message_type: str = None              # from MSH-9
     declared_charset: str = None          # from MSH-18
+    # name -> list of Segment in message order, filled by parse_hl7
+    segments_by_name: dict = field(default_factory=dict, repr=False, compare=False)
+
+
+_MLLP_END_RE = re.compile(r'\x1c[\r\n]*$')
+_START_ARTIFACT_RE = re.compile(r'<VT>|<SB>', re.IGNORECASE)
+_END_ARTIFACT_RE = re.compile(r'<FS>|<EB>', re.IGNORECASE)
+_CR_ARTIFACT_RE = re.compile(r'<CR>', re.IGNORECASE)
+_SEG_BOUNDARY_RE = re.compile(
+    r'(?<=.)(?=(?:MSH|MSA|EVN|PID|PV1|PV2|NK1|ORC|OBR|OBX|DG1|IN1|AL1|GT1|NTE|ERR'
+    r'|QRD|QRF|MRG|SCH|TXA|DSP|ZDS|ZPD|Z[A-Z][A-Z0-9])\|)')
 
 
 def normalize_message(raw):
@@ -53,13 +74,16 @@ def normalize_message(raw):
     content = raw
 
     # Strip MLLP framing: VT (0x0b) at start, FS (0x1c) + optional CR at end
-    content = re.sub(r'^\x0b', '', content)
-    content = re.sub(r'\x1c[\r\n]*$', '', content)
+    if content.startswith('\x0b'):
+        content = content[1:]
+    if '\x1c' in content:
+        content = _MLLP_END_RE.sub('', content)
 
     # Strip common log/dump artifacts
-    content = re.sub(r'<VT>|<SB>', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'<FS>|<EB>', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'<CR>', '\r', content, flags=re.IGNORECASE)
+    if '<' in content:
+        content = _START_ARTIFACT_RE.sub('', content)
+        content = _END_ARTIFACT_RE.sub('', content)
+        content = _CR_ARTIFACT_RE.sub('\r', content)
 
     # Handle 0x0b and 0x1c mid-message
     content = content.replace('\x0b', '').replace('\x1c', '')
@@ -108,19 +132,40 @@ def normalize_message(raw):
         return [s for s in content.split('\n') if s.strip()]
 
     # Single line: look for segment boundaries
-    seg_pattern = r'(?<=.)(?=(?:MSH|MSA|EVN|PID|PV1|PV2|NK1|ORC|OBR|OBX|DG1|IN1|AL1|GT1|NTE|ERR|QRD|QRF|MRG|SCH|TXA|DSP|ZDS|ZPD|Z[A-Z][A-Z0-9])\|)'
-    if re.search(seg_pattern, content):
-        return [s for s in re.split(seg_pattern, content) if s.strip()]
+    if _SEG_BOUNDARY_RE.search(content):
+        return [s for s in _SEG_BOUNDARY_RE.split(content) if s.strip()]
 
     # Truly a single segment
     return [content]
 
 
+# Batch/file envelope segments wrapping a group of messages
+_BATCH_ENVELOPE = ('FHS', 'BHS', 'BTS', 'FTS')
+
+
+def split_segments(segments):
+    """Group normalize_message output into one list per MSH-started message.
+
+    FHS/BHS/BTS/FTS envelope segments are dropped, as is anything before
+    the first MSH. Only segment boundaries are found; nothing is parsed.
+    """
+    messages = []
+    for seg in segments:
+        name = seg[:3]
+        if name == 'MSH':
+            messages.append([seg])
+        elif messages and name not in _BATCH_ENVELOPE:
+            messages[-1].append(seg)
+    return messages
+
+
 def split_components(value):
     """Split a field value into components on ^, and subcomponents on &."""
     if not value or '^' not in value:
         return []
     parts = value.split('^')
+    if '&' not in value:
+        return [Component(idx + 1, comp, []) for idx, comp in enumerate(parts)]
     return [Component(
         index=idx + 1,
         value=comp,
@@ -158,6 +203,13 @@ def _parse_field(address, field_num, raw_value):
     return f
 
 
+def _parse_raw_field(address, field_num, raw_value):
+    """Build a Field, skipping component/repetition parsing for plain values."""
+    if '^' in raw_value or '~' in raw_value:
+        return _parse_field(address, field_num, raw_value)
+    return Field(field_num, address, raw_value, raw_value, [], [])
+
+
 def reparse_field(field, new_raw):
     """Update a Field's value/components/repetitions from a new raw_value."""
     field.raw_value = new_raw
@@ -181,6 +233,31 @@ def reparse_field(field, new_raw):
         field.repetitions = []
 
 
+def replace_component(field, comp_index, new_value):
+    """Set component comp_index (1-based) of a Field's first repetition.
+
+    Only the first repetition is re-split; the others are kept as-is.
+    """
+    if '~' in new_value:
+        # Value adds repetitions of its own: reparse the whole field
+        values = [c.value for c in field.components]
+        values[comp_index - 1] = new_value
+        tail = field.raw_value[len(field.value):] if field.repetitions else ''
+        reparse_field(field, '^'.join(values) + tail)
+        return
+    field.components[comp_index - 1].value = new_value
+    first = '^'.join(c.value for c in field.components)
+    components = split_components(first)
+    if field.repetitions:
+        field.raw_value = first + field.raw_value[len(field.value):]
+        field.repetitions[0].value = first
+        field.repetitions[0].components = components
+    else:
+        field.raw_value = first
+    field.value = first
+    field.components = components
+
+
 def rebuild_raw_line(seg_name, fields):
     """Rebuild a segment's raw_line from its field values."""
     if seg_name == "MSH":
@@ -201,7 +278,11 @@ def rebuild_raw_line(seg_name, fields):
 
 def parse_hl7(raw):
     """Parse raw HL7 text into a ParsedMessage, or None if empty."""
-    segments_raw = normalize_message(raw)
+    return parse_segments(normalize_message(raw))
+
+
+def parse_segments(segments_raw):
+    """Parse normalize_message output into a ParsedMessage, or None if empty."""
     if not segments_raw:
         return None
 
@@ -213,27 +294,24 @@ def parse_hl7(raw):
         seg_name = fields[0]
         if not seg_name or len(seg_name) < 2:
             continue
+        # Shared with the definition keys and every repeat of the segment,
+        # so name comparisons and lookups hit the identity fast path
+        seg_name = sys.intern(seg_name)
 
         segment_counts[seg_name] = segment_counts.get(seg_name, 0) + 1
         seg_rep_idx = segment_counts[seg_name]
 
-        seg = Segment(
-            name=seg_name,
-            rep_index=seg_rep_idx,
-            fields=[],
-            raw_line=seg_line
-        )
-
+        seg_fields = []
         if seg_name == 'MSH':
             # MSH-1: field separator (always |)
-            seg.fields.append(Field(
+            seg_fields.append(Field(
                 field_num=1, address='MSH-1',
                 value='|', raw_value='|',
                 components=[], repetitions=[]
             ))
             # MSH-2: encoding characters
             if len(fields) > 1:
-                seg.fields.append(Field(
+                seg_fields.append(Field(
                     field_num=2, address='MSH-2',
                     value=fields[1], raw_value=fields[1],
                     components=[], repetitions=[]
@@ -241,29 +319,34 @@ def parse_hl7(raw):
             # MSH-3 onwards: fields[2] = MSH-3, etc.
             for j in range(2, len(fields)):
                 field_num = j + 1
-                addr = f'MSH-{field_num}'
-                seg.fields.append(_parse_field(addr, field_num, fields[j]))
+                seg_fields.append(_parse_raw_field(f'MSH-{field_num}', field_num, fields[j]))
         else:
             # Normal segments: fields[1] = SEG-1, etc.
             addr_prefix = seg_name + (f'[{seg_rep_idx}]' if seg_rep_idx > 1 else '')
             for j in range(1, len(fields)):
-                addr = f'{addr_prefix}-{j}'
-                seg.fields.append(_parse_field(addr, j, fields[j]))
+                seg_fields.append(_parse_raw_field(f'{addr_prefix}-{j}', j, fields[j]))
+
+        seg = Segment(
+            name=seg_name,
+            rep_index=seg_rep_idx,
+            fields=seg_fields,
+            raw_line=seg_line
+        )
 
         # Extract metadata from MSH
         if seg_name == 'MSH':
-            version_field = next((f for f in seg.fields if f.field_num == 12), None)
+            version_field = seg.fields_by_num.get(12)
             if version_field:
                 ver = version_field.value
                 if ver and '^' in ver:
                     ver = ver.split('^')[0]
                 result.version = ver
 
-            msg_type_field = next((f for f in seg.fields if f.field_num == 9), None)
+            msg_type_field = seg.fields_by_num.get(9)
             if msg_type_field:
                 result.message_type = msg_type_field.value
 
-            charset_field = next((f for f in seg.fields if f.field_num == 18), None)
+            charset_field = seg.fields_by_num.get(18)
             if charset_field:
                 charset = charset_field.value or ''
                 if '~' in charset:
@@ -271,5 +354,6 @@ def parse_hl7(raw):
                 result.declared_charset = charset
 
         result.segments.append(seg)
+        result.segments_by_name.setdefault(seg_name, []).append(seg)
 
     return result
@@ -9,9 +9,39 @@ def load_profile(path):
         profile = json.load(f)
     if not isinstance(profile, dict) or 'name' not in profile:
         raise ValueError('Invalid profile: missing "name" field')
+    _flatten_profile(profile)
     return profile
 
 
+def _key_num(key):
+    """Int for a canonical number key ("3"), else None ("03", "_comment", "")."""
+    if key.isdecimal() and key.isascii() and str(int(key)) == key:
+        return int(key)
+    return None
+
+
+def _flatten_profile(profile):
+    """Index field/component overlays by (seg, field[, comp]) int tuples.
+
+    Only keys that str(field_num) would produce are indexed, so flattened
+    and unflattened lookups match exactly the same keys.
+    """
+    flat_fields = {}
+    flat_components = {}
+    for seg_name, seg in (profile.get('segments') or {}).items():
+        for fnum_str, fld in (seg.get('fields') or {}).items():
+            fnum = _key_num(fnum_str)
+            if fnum is None:
+                continue
+            flat_fields[(seg_name, fnum)] = fld
+            for cnum_str, comp in (fld.get('components') or {}).items():
+                cnum = _key_num(cnum_str)
+                if cnum is not None:
+                    flat_components[(seg_name, fnum, cnum)] = comp
+    profile['_flat_fields'] = flat_fields
+    profile['_flat_components'] = flat_components
+
+
 def get_profile_segment(profile, seg_name):
     """Get profile segment info. Returns dict or None."""
     if not profile or 'segments' not in profile:
@@ -21,6 +51,11 @@ def get_profile_segment(profile, seg_name):
 
 def get_profile_field(profile, seg_name, field_num):
     """Get profile field overlay for a segment field. Returns dict or None."""
+    if not profile:
+        return None
+    flat = profile.get('_flat_fields')
+    if flat is not None:
+        return flat.get((seg_name, field_num))
     seg = get_profile_segment(profile, seg_name)
     if not seg or 'fields' not in seg:
         return None
@@ -29,6 +64,11 @@ def get_profile_field(profile, seg_name, field_num):
 
 def get_profile_component(profile, seg_name, field_num, comp_index):
     """Get profile component overlay. Returns dict or None."""
+    if not profile:
+        return None
+    flat = profile.get('_flat_components')
+    if flat is not None:
+        return flat.get((seg_name, field_num, comp_index))
     fld = get_profile_field(profile, seg_name, field_num)
     if not fld or 'components' not in fld:
         return None
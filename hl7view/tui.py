@@ -2,6 +2,8 @@
 
 import configparser
 import os
+import re
+from collections import deque
 import subprocess
 
 from textual.app import App, ComposeResult
@@ -11,15 +13,20 @@ from textual.screen import Screen
 from textual.widgets import DirectoryTree, Footer, Header, Input, Static, Tree
 from textual.widget import Widget
 from textual import work
+from textual.worker import get_current_worker
+from rich.style import Style
 from rich.table import Table
-from rich.text import Text
+from rich.text import Span, Text
 
 from .definitions import (
-    DATA_TYPES, get_seg_def, get_field_def, resolve_version,
+    DATA_TYPES, get_seg_def, get_field_defs, resolve_version,
     MSH18_TO_ENCODING, HL7_DEFS,
 )
-from .mllp import mllp_send, reconstruct_message
-from .parser import ParsedMessage, parse_hl7, reparse_field, rebuild_raw_line
+from .mllp import MllpClientPool, reconstruct_message
+from .parser import (
+    ParsedMessage, normalize_message, parse_hl7, reparse_field, replace_component,
+    rebuild_raw_line,
+)
 from .anonymize import anonymize_message, transliterate
 from .cli import read_file, read_clipboard
 from .encoding import detect_encoding
@@ -37,6 +44,39 @@ DIM = "#585b70"
 SURFACE = "#313244"
 BASE = "#1e1e2e"
 
+# Pre-parsed styles, so building thousands of tree nodes or raw-view spans
+# doesn't re-parse the same color strings
+_S_BOLD_ROSE = Style(color=ROSE, bold=True)
+_S_ROSE = Style(color=ROSE)
+_S_GREEN = Style(color=GREEN)
+_S_ORANGE = Style(color=ORANGE)
+_S_BLUE = Style(color=BLUE)
+_S_SAPPHIRE = Style(color=SAPPHIRE)
+_S_YELLOW = Style(color=YELLOW)
+_S_TEAL = Style(color=TEAL)
+_S_DIM = Style(color=DIM)
+_S_TEXT = Style(color="#cdd6f4")
+_S_BOLD_GREEN = Style(color=GREEN, bold=True)
+_S_BOLD_SAPPHIRE = Style(color=SAPPHIRE, bold=True)
+_S_BOLD_DIM = Style(color=DIM, bold=True)
+_S_BOLD_YELLOW = Style(color=YELLOW, bold=True)
+_S_BOLD_BLUE = Style(color=BLUE, bold=True)
+_S_RED = Style(color="red")
+_S_BOLD_RED = Style(color="red", bold=True)
+
+# Raw view: one token per separator or run of value text
+_RAW_TOKEN_RE = re.compile(r"[|~^&]|[^|~^&]+")
+_RAW_SEP_STYLES = {"|": _S_DIM, "~": _S_TEAL, "^": _S_DIM, "&": _S_DIM}
+
+# Constant send-pane headers; copy() before appending to them
+_SEND_RULE = "\u2500" * 40 + "\n"
+_SENT_HEADER = Text()
+_SENT_HEADER.append("SENT MESSAGE\n", style=_S_BOLD_GREEN)
+_SENT_HEADER.append(_SEND_RULE, style=_S_DIM)
+_ERROR_HEADER = Text()
+_ERROR_HEADER.append("ERROR\n", style=_S_BOLD_RED)
+_ERROR_HEADER.append(_SEND_RULE, style=_S_DIM)
+
 
 def _resolve_obx5_type(fields):
     """Get OBX-5 data type from OBX-2 value."""
@@ -75,20 +115,43 @@ def _field_data_type(seg_name, field, field_def, obx5_type):
     return dt
 
 
-def load_tls_config(host, port):
-    """Load TLS config for host:port from ~/.config/hl7view/tls.conf.
+def _field_label(address, display_name, dt, dt_suffix, val):
+    """Build the address/name/type/value part of a field tree label.
 
-    Returns a tls_config dict or None if no config found.
+    The ljust() padding lines up the name/type/value columns across rows;
+    a visible field always has a value or "(empty)" after it, so the pad
+    is never trailing whitespace.
     """
-    conf_path = os.path.expanduser("~/.config/hl7view/tls.conf")
-    if not os.path.isfile(conf_path):
-        return None
-    cp = configparser.ConfigParser()
-    cp.read(conf_path)
-    section = f"{host}:{port}"
-    if section not in cp:
-        return None
-    s = cp[section]
+    label = Text()
+    label.append(address.ljust(12), style=_S_BLUE)
+    if display_name:
+        label.append(display_name.ljust(28), style=_S_GREEN)
+    if dt:
+        label.append(" " + dt + dt_suffix.ljust(5), style=_S_ORANGE)
+    if val:
+        label.append("  " + val, style=_S_TEXT)
+    return label
+
+
+def _spec_table():
+    """Fresh key/value table for the detail panel's specification section."""
+    spec = Table(show_header=False, box=None, padding=(0, 1))
+    spec.add_column("Key", style=_S_DIM, width=14)
+    spec.add_column("Value")
+    return spec
+
+
+TLS_CONF_PATH = os.path.expanduser("~/.config/hl7view/tls.conf")
+
+# Messages kept for back/forward; older entries are dropped as new ones load
+HISTORY_LIMIT = 50
+
+# Parsed tls.conf, keyed by file mtime so edits are picked up
+_tls_conf_cache = {"mtime": None, "configs": {}}
+
+
+def _parse_tls_section(s):
+    """Build a tls_config dict (or None) from one tls.conf section."""
     config = {}
     if s.get("ca_cert"):
         config["ca_cert"] = s["ca_cert"]
@@ -104,18 +167,39 @@ def load_tls_config(host, port):
     return config if config else None
 
 
+def load_tls_config(host, port):
+    """Load TLS config for host:port from ~/.config/hl7view/tls.conf.
+
+    Returns a tls_config dict or None if no config found.
+    """
+    try:
+        mtime = os.stat(TLS_CONF_PATH).st_mtime
+    except OSError:
+        return None
+    if _tls_conf_cache["mtime"] != mtime:
+        cp = configparser.ConfigParser()
+        cp.read(TLS_CONF_PATH)
+        _tls_conf_cache["configs"] = {
+            name: _parse_tls_section(cp[name]) for name in cp.sections()
+        }
+        _tls_conf_cache["mtime"] = mtime
+    config = _tls_conf_cache["configs"].get(f"{host}:{port}")
+    return dict(config) if config is not None else None
+
+
 class HL7DirectoryTree(DirectoryTree):
     """DirectoryTree filtered to show only directories and .hl7 files."""
 
     def filter_paths(self, paths):
-        return [p for p in paths if p.is_dir() or p.suffix.lower() == '.hl7']
+        # Suffix check first: it's a string op, is_dir() is a stat() call
+        return (p for p in paths if p.suffix.lower() == '.hl7' or p.is_dir())
 
 
 class ProfileDirectoryTree(DirectoryTree):
     """DirectoryTree filtered to show only directories and .json files."""
 
     def filter_paths(self, paths):
-        return [p for p in paths if p.is_dir() or p.suffix.lower() == '.json']
+        return (p for p in paths if p.suffix.lower() == '.json' or p.is_dir())
 
 
 class HelpScreen(Screen):
@@ -142,7 +226,7 @@ class HelpScreen(Screen):
 
     def compose(self) -> ComposeResult:
         help_text = Text()
-        help_text.append("Keyboard Shortcuts\n\n", style="bold #89b4fa")
+        help_text.append("Keyboard Shortcuts\n\n", style=_S_BOLD_BLUE)
 
         sections = [
             ("Navigation", [
@@ -180,10 +264,10 @@ class HelpScreen(Screen):
         ]
 
         for section_name, bindings in sections:
-            help_text.append(f"  {section_name}\n", style="bold #f9e2af")
+            help_text.append(f"  {section_name}\n", style=_S_BOLD_YELLOW)
             for key, desc in bindings:
-                help_text.append(f"    {key:<10}", style="#a6e3a1")
-                help_text.append(f"{desc}\n", style="#cdd6f4")
+                help_text.append(f"    {key:<10}", style=_S_GREEN)
+                help_text.append(f"{desc}\n", style=_S_TEXT)
             help_text.append("\n")
 
         help_text.append("Press Esc or ? to close", style="dim")
@@ -346,6 +430,10 @@ class HL7ViewerApp(App):
         Binding("escape", "clear_search", "Clear", show=False),
     ]
 
+    # NOTE: No __slots__ here. Textual's App/DOMNode bases already carry an
+    # instance __dict__ (reactives live in it), so slots on this subclass
+    # would not remove it; hot paths cache what they need in locals instead.
+
     def __init__(self, parsed: ParsedMessage, version: str = None,
                  filename: str = None, enc_info: dict = None,
                  extra_messages: list = None, profile: dict = None,
@@ -369,14 +457,23 @@ class HL7ViewerApp(App):
         elif version == "2.8":
             self._version_idx = 3
         self._current_node_data = None
+        self._detail_key = None       # what the detail panel last rendered
         # Anonymization state
         self._anon_active = False
         self._anon_non_ascii = False  # False=ASCII pool, True=Estonian
-        self._anon_parsed = None      # cached anonymized copy
+        self._anon_cache = {}         # non_ascii pool flag -> anonymized copy
+        self._anon_pending = False    # anonymize worker running for current pool
         # Transliteration state
         self._transliterate_active = False
+        self._tx_cache = {}           # text -> transliterated text
+        self._obx5_cache = {}         # id(OBX segment) -> (segment, OBX-5 type)
+        self._search_cache = {}       # (id(segment), version) -> (segment, search text)
+        self._raw_text_cache = {}     # (id(message), transliterate) -> (message, Text)
+        self._profile_counts = None   # (message, profile, validation counts)
         # Raw view state
         self._raw_view_active = False
+        self._tree_dirty = False
+        self._tree_source = None      # original message the tree nodes were built from
         # Edit state
         self._modified = False
         self._editing_field_data = None
@@ -384,11 +481,18 @@ class HL7ViewerApp(App):
         self._last_send_target = "localhost:6001"
         self._send_view_active = False
         self._send_result = None
-        # History state — seed with all files from CLI args
-        self._history = [(parsed, filename or "", enc_info or {})]
-        if extra_messages:
-            for ep, ef, ee in extra_messages:
-                self._history.append((ep, ef, ee))
+        self._sent_pane_text = None   # raw Text the sent pane was built from
+        self._mllp_pool = MllpClientPool()  # connections kept open between sends
+        # History state — seed with all files from CLI args (never trimmed
+        # below their count, so every file given stays reachable). Extra
+        # entries may hold raw message text, parsed when first shown
+        extra_messages = extra_messages or []
+        self._history = deque(
+            [(parsed, filename or "", enc_info or {})],
+            maxlen=max(HISTORY_LIMIT, 1 + len(extra_messages)),
+        )
+        for ep, ef, ee in extra_messages:
+            self._history.append((ep, ef, ee))
         self._history_idx = 0
         self._restoring_history = False
         self._last_file_dir = os.getcwd()
@@ -425,26 +529,66 @@ class HL7ViewerApp(App):
         yield Input(placeholder="Send via MLLP \u2014 host:port [--tls|--tls-insecure] (Esc to cancel)", id="send-bar")
         yield Footer()
 
+    def on_unmount(self) -> None:
+        self._mllp_pool.close()
+
     def on_mount(self) -> None:
+        # Cache widget references; all are declared once in compose()
+        self._w_tree = self.query_one("#field-tree", Tree)
+        self._w_main = self.query_one("#main-split")
+        self._w_send_split = self.query_one("#send-split")
+        self._w_raw_panel = self.query_one("#raw-panel")
+        self._w_raw_content = self.query_one("#raw-content", Static)
+        self._w_search = self.query_one("#search-bar", Input)
+        self._w_send_bar = self.query_one("#send-bar", Input)
+        self._w_edit = self.query_one("#edit-bar", Input)
+        self._w_profile_tree = self.query_one("#profile-tree", ProfileDirectoryTree)
+        self._w_file_tree = self.query_one("#file-tree", HL7DirectoryTree)
+        self._w_header = self.query_one("#msg-header", Static)
+        self._w_title = self.query_one("#detail-title", Static)
+        self._w_spec = self.query_one("#spec-section", Static)
+        self._w_comp = self.query_one("#comp-section", Static)
+        self._w_rep = self.query_one("#rep-section", Static)
+        self._w_sent = self.query_one("#send-sent")
+        self._w_sent_content = self.query_one("#send-sent-content", Static)
+        self._w_response = self.query_one("#send-response")
+        self._w_response_content = self.query_one("#send-response-content", Static)
         self._update_header()
         self._build_tree()
-        tree = self.query_one("#field-tree", Tree)
+        tree = self._w_tree
         tree.show_root = False
         tree.guide_depth = 0
         tree.focus()
 
     def _tx(self, text):
-        """Apply transliteration if active."""
-        if self._transliterate_active:
-            return transliterate(text)
+        """Apply transliteration if active (memoized; labels repeat a lot)."""
+        if not self._transliterate_active:
+            return text
+        result = self._tx_cache.get(text)
+        if result is None:
+            result = self._tx_cache[text] = transliterate(text)
+        return result
+
+    def _tx_clip(self, text, limit, keep):
+        """_tx, then cut to keep chars plus "..." if longer than limit.
+
+        transliterate() maps every char to one or more chars, so a long
+        value only needs its displayed prefix converted.
+        """
+        if len(text) > limit:
+            return self._tx(text[:keep])[:keep] + "..."
+        text = self._tx(text)
+        if len(text) > limit:
+            text = text[:keep] + "..."
         return text
 
     def _load_message(self, parsed, filename, enc_info):
         """Central reload: set new message, reset all state, rebuild UI."""
         if not self._restoring_history:
             # Trim any forward entries after current position
-            self._history = self._history[:self._history_idx + 1]
-            # Push the new message
+            while len(self._history) > self._history_idx + 1:
+                self._history.pop()
+            # Push the new message (drops the oldest entry when full)
             self._history.append((parsed, filename, enc_info))
             self._history_idx = len(self._history) - 1
         self.original_parsed = parsed
@@ -457,47 +601,61 @@ class HL7ViewerApp(App):
         # Reset anon/translit
         self._anon_active = False
         self._anon_non_ascii = False
-        self._anon_parsed = None
+        self._anon_cache = {}
+        self._anon_pending = False
+        self.workers.cancel_group(self, "anon")
         self._transliterate_active = False
+        self._tx_cache = {}
+        self._obx5_cache = {}
+        self._search_cache = {}
+        self._raw_text_cache = {}
         self._raw_view_active = False
         self._send_view_active = False
         self._send_result = None
         # Hide overlays, restore main view
-        self.query_one("#raw-panel").remove_class("visible")
-        self.query_one("#send-split").remove_class("visible")
-        self.query_one("#file-tree").remove_class("visible")
-        self.query_one("#main-split").remove_class("hidden")
+        self._w_raw_panel.remove_class("visible")
+        self._w_send_split.remove_class("visible")
+        self._w_file_tree.remove_class("visible")
+        self._w_main.remove_class("hidden")
         # Reset search
+        self._cancel_search_debounce()
         self.search_query = ""
-        search_bar = self.query_one("#search-bar", Input)
+        search_bar = self._w_search
         search_bar.value = ""
         search_bar.remove_class("visible")
         # Reset detail
         self._current_node_data = None
-        self.query_one("#detail-title", Static).update("")
-        self.query_one("#spec-section", Static).update("")
-        self.query_one("#comp-section", Static).update("")
-        self.query_one("#rep-section", Static).update("")
+        self._clear_detail()
         # Rebuild
         self._update_header()
         self._build_tree()
 
+    @work(thread=True, exclusive=True, group="open-file")
     def _open_file_path(self, path):
-        """Read and load a file by path."""
+        """Read and parse a file in a worker thread, then load it."""
         path = path.strip()
         path = os.path.expanduser(path)
         if not os.path.isfile(path):
-            self.notify(f"File not found: {path}", severity="error", timeout=3)
+            self.call_from_thread(
+                self.notify, f"File not found: {path}", severity="error", timeout=3)
             return
         try:
             text, enc_info = read_file(path)
         except (OSError, IOError) as e:
-            self.notify(f"Error: {e}", severity="error", timeout=3)
+            self.call_from_thread(self.notify, f"Error: {e}", severity="error", timeout=3)
             return
         parsed = parse_hl7(text)
         if not parsed:
-            self.notify("No HL7 segments found", severity="error", timeout=3)
+            self.call_from_thread(
+                self.notify, "No HL7 segments found", severity="error", timeout=3)
+            return
+        # A newer selection superseded this one while it was reading
+        if get_current_worker().is_cancelled:
             return
+        self.call_from_thread(self._finish_open_file, path, parsed, enc_info)
+
+    def _finish_open_file(self, path, parsed, enc_info):
+        """Load a file parsed by _open_file_path (runs on the UI thread)."""
         self._last_file_dir = os.path.dirname(os.path.abspath(path))
         self._load_message(parsed, os.path.basename(path), enc_info)
         self.notify(f"Loaded {os.path.basename(path)}", timeout=2)
@@ -509,6 +667,9 @@ class HL7ViewerApp(App):
         """
         if not self._profile or not self._profile.get("segments"):
             return 0, 0, [], []
+        cached = self._profile_counts
+        if cached is not None and cached[0] is self.parsed and cached[1] is self._profile:
+            return cached[2]
         profile_seg_names = set(self._profile["segments"].keys())
         msg_seg_names = {s.name for s in self.parsed.segments}
         missing_segs = [s for s in profile_seg_names if s not in msg_seg_names]
@@ -524,28 +685,41 @@ class HL7ViewerApp(App):
         unexpected_segs = unique_unexpected
         required_empty = 0
         value_mismatch = 0
-        for seg_name, seg_def in self._profile["segments"].items():
-            if seg_name not in msg_seg_names:
-                continue
-            if not seg_def.get("fields"):
+        p_segs = self._profile["segments"]
+        for seg in self.parsed.segments:
+            seg_def = p_segs.get(seg.name)
+            if not seg_def or not seg_def.get("fields"):
                 continue
-            for seg in self.parsed.segments:
-                if seg.name != seg_name:
+            by_num = seg.fields_by_num
+            for field_num, p_fld in seg_def["fields"].items():
+                try:
+                    fld = by_num.get(int(field_num))
+                except ValueError:
                     continue
-                for field_num, p_fld in seg_def["fields"].items():
-                    fld = None
-                    for f in seg.fields:
-                        if f.field_num == int(field_num):
-                            fld = f
-                            break
-                    req, mis = _check_field_validation(p_fld, fld)
-                    if req:
-                        required_empty += 1
-                    if mis:
-                        value_mismatch += 1
-        return required_empty, value_mismatch, missing_segs, unexpected_segs
+                req, mis = _check_field_validation(p_fld, fld)
+                if req:
+                    required_empty += 1
+                if mis:
+                    value_mismatch += 1
+        counts = (required_empty, value_mismatch, missing_segs, unexpected_segs)
+        # Header refreshes often (every search keystroke); the counts only
+        # change with the message, the profile, or an edit
+        self._profile_counts = (self.parsed, self._profile, counts)
+        return counts
+
+    _header_flush_pending = False
+    _header_text = None
 
     def _update_header(self) -> None:
+        """Schedule a header refresh; calls within one handler coalesce."""
+        if not self._header_flush_pending:
+            self._header_flush_pending = True
+            self.call_after_refresh(self._flush_header)
+
+    def _flush_header(self) -> None:
+        if not self._header_flush_pending:
+            return
+        self._header_flush_pending = False
         msg_type = self.parsed.message_type or "???"
         ver_raw = self.parsed.version or "?"
         ver_eff = self.effective_version
@@ -596,41 +770,117 @@ class HL7ViewerApp(App):
             parts.append(f'/{self.search_query}')
         if len(self._history) > 1:
             parts.append(f"[{self._history_idx + 1}/{len(self._history)}]")
-        header_widget = self.query_one("#msg-header", Static)
-        header_widget.update(" \u2502 ".join(parts))
+        text = " \u2502 ".join(parts)
+        if text != self._header_text:
+            self._header_text = text
+            self._w_header.update(text)
 
     def _build_tree(self) -> None:
-        tree = self.query_one("#field-tree", Tree)
-        tree.clear()
+        if self._raw_view_active or self._send_view_active:
+            # Tree is hidden; rebuild when it is shown again
+            self._tree_dirty = True
+            return
+        self._tree_dirty = False
+        tree = self._w_tree
+        # Suspend repaints so the rebuild is drawn once, not per node added
+        with self.batch_update():
+            if self._tree_source is not self.original_parsed:
+                # Different message: nothing to reuse. Anonymized copies
+                # share their original, so toggling keeps the expand state
+                tree.clear()
+                self._tree_source = self.original_parsed
+            self._sync_children(tree.root, self._tree_spec(), expand=True)
+
+    def _sync_children(self, parent, items, expand=False) -> None:
+        """Make parent's children match items, reusing existing nodes by key.
+
+        items is a list of (key, label, data, children) in display order.
+        Surviving nodes keep their expand state and the cursor stays put;
+        only added/removed nodes and changed labels touch the widget.
+        """
+        keys = {item[0] for item in items}
+        for node in list(parent.children):
+            if node.data["key"] not in keys:
+                node.remove()
+        # Survivors are already in display order, so inserting each new
+        # node at its final index keeps the whole list ordered
+        existing = {node.data["key"]: node for node in parent.children}
+        for i, (key, label, data, children) in enumerate(items):
+            node = existing.get(key)
+            if node is None:
+                node = parent.add(label, data=data, before=i, expand=expand)
+            else:
+                if node.label != label:
+                    node.set_label(label)
+                old_data = node.data
+                node.data = data
+                if children is None:
+                    # Field node: keep built component rows if they would
+                    # come out the same, else drop them and rebuild if open
+                    if (node.children and old_data["field"] is data["field"]
+                            and old_data["comp_sig"] == data["comp_sig"]):
+                        data["components_pending"] = False
+                    else:
+                        if node.children:
+                            node.remove_children()
+                        if node.is_expanded and data["components_pending"]:
+                            self._add_component_nodes(node)
+            if children is not None:
+                self._sync_children(node, children)
+
+    def _tree_spec(self) -> list:
+        """Segment and field nodes for the current message and filters.
+
+        Returns [(key, label, data, field_items)] where field_items is
+        [(key, label, data, None)]; component nodes are built on expand.
+        """
         version = self.effective_version
         query = self.search_query.lower()
+        query_has_space = " " in query
+        p_seg_cache = {}
+        spec = []
 
         for seg in self.parsed.segments:
             seg_def = get_seg_def(seg.name, version)
             seg_desc = seg_def["name"] if seg_def else ""
-            p_seg = get_profile_segment(self._profile, seg.name)
+            if seg.name not in p_seg_cache:
+                p_seg_cache[seg.name] = get_profile_segment(self._profile, seg.name)
+            p_seg = p_seg_cache[seg.name]
             if not seg_desc and p_seg:
                 seg_desc = p_seg.get("description", "")
             rep_label = f"[{seg.rep_index}]" if seg.rep_index > 1 else ""
+            seg_key = (seg.name, seg.rep_index)
 
-            obx5_type = None
-            if seg.name == "OBX":
-                obx5_type = _resolve_obx5_type(seg.fields)
+            obx5_type = self._obx5_type(seg) if seg.name == "OBX" else None
+            fld_defs = get_field_defs(seg.name, version)
+            n_defs = len(fld_defs)
+
+            # Segments with no possible match are dropped below anyway;
+            # one substring test rules them out without visiting fields
+            if query and query not in self._search_text(seg, version, fld_defs, obx5_type):
+                continue
 
             # Collect field nodes (for search filtering)
             field_items = []
             for fld in seg.fields:
-                fld_def = get_field_def(seg.name, fld.field_num, version)
-                dt = _field_data_type(seg.name, fld, fld_def, obx5_type)
-                fname = fld_def["name"] if fld_def else ""
-
                 if not fld.value and not fld.raw_value and not self.show_empty:
                     continue
 
+                fld_def = fld_defs[fld.field_num] if fld.field_num < n_defs else None
+                dt = _field_data_type(seg.name, fld, fld_def, obx5_type)
+                fname = fld_def["name"] if fld_def else ""
+
                 # Search filter
                 if query:
-                    searchable = f"{fld.address} {fname} {dt} {fld.value}".lower()
-                    if query not in searchable:
+                    if query_has_space:
+                        # May span parts, so match against the joined text
+                        searchable = f"{fld.address} {fname} {dt} {fld.value}".lower()
+                        if query not in searchable:
+                            continue
+                    elif not (query in fld.address.lower()
+                              or (fname and query in fname.lower())
+                              or (dt and query in dt.lower())
+                              or (fld.value and query in fld.value.lower())):
                         continue
 
                 field_items.append((fld, fld_def, dt, fname))
@@ -641,18 +891,20 @@ class HL7ViewerApp(App):
 
             # Segment node
             seg_label = Text()
-            seg_label.append(f"{seg.name}{rep_label}", style=f"bold {ROSE}")
+            seg_label.append(seg.name + rep_label, style=_S_BOLD_ROSE)
             if seg_desc:
-                seg_label.append(f"  {self._tx(seg_desc)}", style=ROSE)
+                seg_label.append("  " + self._tx(seg_desc), style=_S_ROSE)
             if p_seg:
-                seg_label.append("  Profile", style=TEAL)
+                seg_label.append("  Profile", style=_S_TEAL)
             if self._profile and self._profile.get("segments") and seg.name not in self._profile["segments"]:
-                seg_label.append("  Unexpected", style=YELLOW)
-            seg_node = tree.root.add(
+                seg_label.append("  Unexpected", style=_S_YELLOW)
+            field_nodes = []
+            spec.append((
+                seg_key,
                 seg_label,
-                data={"type": "segment", "segment": seg, "seg_def": seg_def},
-                expand=True,
-            )
+                {"type": "segment", "segment": seg, "seg_def": seg_def, "key": seg_key},
+                field_nodes,
+            ))
 
             for fld, fld_def, dt, fname in field_items:
                 # Profile overlay for field name
@@ -662,84 +914,132 @@ class HL7ViewerApp(App):
                     display_name = p_fld["customName"]
 
                 # Build field label
-                fld_label = Text()
-                fld_label.append(f"{fld.address:<12}", style=BLUE)
-                if display_name:
-                    fld_label.append(f"{self._tx(display_name):<28}", style=GREEN)
-                if dt:
-                    dt_suffix = ""
-                    if fld_def and fld_def["dt"] == "*" and seg.name == "OBX" and fld.field_num == 5:
-                        dt_suffix = "\u21902"
-                    fld_label.append(f" {dt}{dt_suffix:<5}", style=ORANGE)
+                dt_suffix = ""
+                if dt and fld_def and fld_def["dt"] == "*" and seg.name == "OBX" and fld.field_num == 5:
+                    dt_suffix = "\u21902"
                 # Value (truncated for display)
-                val = self._tx(fld.value or "")
-                if len(val) > 40:
-                    val = val[:37] + "..."
+                val = self._tx_clip(fld.value or "", 40, 37)
+                fld_label = _field_label(
+                    fld.address, self._tx(display_name) if display_name else "",
+                    dt, dt_suffix, val)
                 if val:
-                    fld_label.append(f"  {val}", style="#cdd6f4")
                     # Profile valueMap lookup
                     if p_fld and p_fld.get("valueMap") and fld.value:
                         mapped = p_fld["valueMap"].get(fld.value)
                         if mapped:
-                            fld_label.append(f" ({mapped})", style=TEAL)
+                            fld_label.append(f" ({mapped})", style=_S_TEAL)
                 elif self.show_empty:
-                    fld_label.append("  (empty)", style=DIM)
+                    fld_label.append("  (empty)", style=_S_DIM)
                 # Repetition badge
                 if fld.repetitions and len(fld.repetitions) > 1:
-                    fld_label.append(f" [{len(fld.repetitions)}x]", style=YELLOW)
+                    fld_label.append(f" [{len(fld.repetitions)}x]", style=_S_YELLOW)
                 # Profile validation badges
                 if p_fld:
                     req_empty, val_mis = _check_field_validation(p_fld, fld)
                     if req_empty:
-                        fld_label.append(" \u25cf", style=ROSE)
+                        fld_label.append(" \u25cf", style=_S_ROSE)
                     if val_mis:
-                        fld_label.append(" \u25cf", style=ORANGE)
-
-                fld_node = seg_node.add(
+                        fld_label.append(" \u25cf", style=_S_ORANGE)
+
+                # Component children are built on first expand
+                has_comps = any(c.value or self.show_empty for c in fld.components)
+                fld_key = fld.field_num
+                # What the component rows depend on besides the field itself
+                # (raw_value catches in-place edits)
+                comp_sig = (fld.raw_value, dt, self.show_empty, self._transliterate_active)
+                field_nodes.append((
+                    fld_key,
                     fld_label,
-                    data={
+                    {
                         "type": "field",
                         "segment": seg,
                         "field": fld,
                         "field_def": fld_def,
                         "data_type": dt,
+                        "components_pending": has_comps,
+                        "comp_sig": comp_sig,
+                        "key": fld_key,
                     },
-                )
-
-                # Component children (collapsed by default)
-                dt_info = DATA_TYPES.get(dt, {})
-                comp_defs = dt_info.get("components", [])
-                if fld.components:
-                    for comp in fld.components:
-                        if not comp.value and not self.show_empty:
-                            continue
-                        comp_name = ""
-                        comp_dt = ""
-                        if comp.index <= len(comp_defs):
-                            comp_name = comp_defs[comp.index - 1].get("name", "")
-                            comp_dt = comp_defs[comp.index - 1].get("dt", "")
-
-                        comp_label = Text()
-                        comp_label.append(f".{comp.index:<3}", style=SAPPHIRE)
-                        if comp_name:
-                            comp_label.append(f"{self._tx(comp_name):<26}", style=GREEN)
-                        if comp_dt:
-                            comp_label.append(f" {comp_dt:<4}", style=ORANGE)
-                        comp_val = self._tx(comp.value) if comp.value else "(empty)"
-                        comp_style = "#cdd6f4" if comp.value else DIM
-                        comp_label.append(f"  {comp_val}", style=comp_style)
-
-                        fld_node.add_leaf(
-                            comp_label,
-                            data={
-                                "type": "component",
-                                "segment": seg,
-                                "field": fld,
-                                "component": comp,
-                                "comp_def": comp_defs[comp.index - 1] if comp.index <= len(comp_defs) else None,
-                                "comp_dt": comp_dt,
-                            },
-                        )
+                    None,
+                ))
+        return spec
+
+    def _search_text(self, seg, version, fld_defs, obx5_type):
+        """Lowercased text of everything the search filter matches in seg.
+
+        One line per field, so a query can only match within a field.
+        Cached per segment and version across rebuilds.
+        """
+        key = (id(seg), version)
+        cached = self._search_cache.get(key)
+        if cached is not None and cached[0] is seg:
+            return cached[1]
+        n_defs = len(fld_defs)
+        lines = []
+        for fld in seg.fields:
+            fld_def = fld_defs[fld.field_num] if fld.field_num < n_defs else None
+            dt = _field_data_type(seg.name, fld, fld_def, obx5_type)
+            fname = fld_def["name"] if fld_def else ""
+            lines.append(f"{fld.address} {fname} {dt} {fld.value}")
+        text = "\n".join(lines).lower()
+        self._search_cache[key] = (seg, text)
+        return text
+
+    def _obx5_type(self, seg):
+        """OBX-5 data type from OBX-2, cached per segment across rebuilds."""
+        cached = self._obx5_cache.get(id(seg))
+        # Holding the segment in the entry keeps its id from being reused
+        if cached is not None and cached[0] is seg:
+            return cached[1]
+        obx5_type = _resolve_obx5_type(seg.fields)
+        self._obx5_cache[id(seg)] = (seg, obx5_type)
+        return obx5_type
+
+    def _add_component_nodes(self, fld_node) -> None:
+        """Populate a field node's component children (collapsed by default)."""
+        data = fld_node.data
+        data["components_pending"] = False
+        seg = data["segment"]
+        fld = data["field"]
+        dt_info = DATA_TYPES.get(data["data_type"], {})
+        comp_defs = dt_info.get("components", [])
+        for comp in fld.components:
+            if not comp.value and not self.show_empty:
+                continue
+            comp_name = ""
+            comp_dt = ""
+            if comp.index <= len(comp_defs):
+                comp_name = comp_defs[comp.index - 1].get("name", "")
+                comp_dt = comp_defs[comp.index - 1].get("dt", "")
+
+            comp_label = Text()
+            comp_label.append(f".{comp.index:<3}", style=_S_SAPPHIRE)
+            if comp_name:
+                comp_label.append(self._tx(comp_name).ljust(26), style=_S_GREEN)
+            if comp_dt:
+                comp_label.append(" " + comp_dt.ljust(4), style=_S_ORANGE)
+            if comp.value:
+                comp_label.append("  " + self._tx(comp.value), style=_S_TEXT)
+            else:
+                comp_label.append("  (empty)", style=_S_DIM)
+
+            fld_node.add_leaf(
+                comp_label,
+                data={
+                    "type": "component",
+                    "segment": seg,
+                    "field": fld,
+                    "component": comp,
+                    "comp_def": comp_defs[comp.index - 1] if comp.index <= len(comp_defs) else None,
+                    "comp_dt": comp_dt,
+                },
+            )
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        """Build component children the first time a field is expanded."""
+        data = event.node.data
+        if isinstance(data, dict) and data.get("components_pending"):
+            self._add_component_nodes(event.node)
 
     def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
         """Edit field when Enter is pressed on a leaf tree node."""
@@ -751,7 +1051,7 @@ class HL7ViewerApp(App):
             return
         self._current_node_data = data
         # Only edit leaf nodes (fields without components, or components)
-        if node.children:
+        if node.children or data.get("components_pending"):
             return
         self.action_edit_field()
 
@@ -767,10 +1067,22 @@ class HL7ViewerApp(App):
         self._update_detail(data)
 
     def _update_detail(self, data: dict) -> None:
-        title_w = self.query_one("#detail-title", Static)
-        spec_w = self.query_one("#spec-section", Static)
-        comp_w = self.query_one("#comp-section", Static)
-        rep_w = self.query_one("#rep-section", Static)
+        # Rebuilds after edits/toggles re-request the same node; skip when
+        # nothing the panel shows has changed (raw_line catches edits)
+        seg = data["segment"]
+        key = (
+            data["type"], seg, seg.raw_line, data.get("field"), data.get("component"),
+            data.get("field_def"), data.get("data_type"), data.get("comp_def"),
+            self.effective_version, self._transliterate_active, self._profile,
+        )
+        if key == self._detail_key:
+            return
+        self._detail_key = key
+
+        title_w = self._w_title
+        spec_w = self._w_spec
+        comp_w = self._w_comp
+        rep_w = self._w_rep
 
         node_type = data["type"]
 
@@ -781,11 +1093,9 @@ class HL7ViewerApp(App):
             seg_desc = self._tx(seg_def['name']) if seg_def else 'Unknown'
             if not seg_def and p_seg:
                 seg_desc = p_seg.get("description", "Unknown")
-            title_w.update(Text(f"{seg.name} \u2014 {seg_desc}", style=f"bold {ROSE}"))
-            spec = Table(show_header=False, box=None, padding=(0, 1))
-            spec.add_column("Key", style=DIM, width=14)
-            spec.add_column("Value")
-            spec.add_row("Segment", Text(seg.name, style=f"bold {ROSE}"))
+            title_w.update(Text(f"{seg.name} \u2014 {seg_desc}", style=_S_BOLD_ROSE))
+            spec = _spec_table()
+            spec.add_row("Segment", Text(seg.name, style=_S_BOLD_ROSE))
             rep_label = f"[{seg.rep_index}]" if seg.rep_index > 1 else "1"
             spec.add_row("Occurrence", rep_label)
             spec.add_row("Fields", str(len(seg.fields)))
@@ -794,20 +1104,18 @@ class HL7ViewerApp(App):
                 spec.add_row("Description", self._tx(seg_def["name"]))
             if p_seg:
                 if p_seg.get("description"):
-                    spec.add_row("Profile", Text(p_seg["description"], style=TEAL))
+                    spec.add_row("Profile", Text(p_seg["description"], style=_S_TEAL))
                 if p_seg.get("custom"):
-                    spec.add_row("Custom", Text("Yes (Z-segment)", style=TEAL))
+                    spec.add_row("Custom", Text("Yes (Z-segment)", style=_S_TEAL))
             if self._profile and self._profile.get("segments") and seg.name not in self._profile["segments"]:
-                spec.add_row("\u26a0 Unexpected", Text("Segment not defined in profile", style=YELLOW))
+                spec.add_row("\u26a0 Unexpected", Text("Segment not defined in profile", style=_S_YELLOW))
             spec_w.update(spec)
             comp_w.update("")
             # Show raw segment line
             raw_text = Text()
-            raw_text.append("Raw segment:\n", style=f"bold {DIM}")
-            raw_line = self._tx(seg.raw_line)
-            if len(raw_line) > 500:
-                raw_line = raw_line[:500] + "..."
-            raw_text.append(raw_line, style=DIM)
+            raw_text.append("Raw segment:\n", style=_S_BOLD_DIM)
+            raw_line = self._tx_clip(seg.raw_line, 500, 500)
+            raw_text.append(raw_line, style=_S_DIM)
             rep_w.update(raw_text)
             return
 
@@ -822,27 +1130,25 @@ class HL7ViewerApp(App):
             display_name = fname
             if p_fld and p_fld.get("customName"):
                 display_name = p_fld["customName"]
-            title_w.update(Text(f"{fld.address} \u2014 {display_name}", style=f"bold {GREEN}"))
+            title_w.update(Text(f"{fld.address} \u2014 {display_name}", style=_S_BOLD_GREEN))
 
             # Specification table
-            spec = Table(show_header=False, box=None, padding=(0, 1))
-            spec.add_column("Key", style=DIM, width=14)
-            spec.add_column("Value")
-            spec.add_row("Segment", Text(seg.name, style=ROSE))
-            spec.add_row("Field", Text(fld.address, style=BLUE))
+            spec = _spec_table()
+            spec.add_row("Segment", Text(seg.name, style=_S_ROSE))
+            spec.add_row("Field", Text(fld.address, style=_S_BLUE))
             if display_name:
                 spec.add_row("Name", display_name)
             if p_fld and p_fld.get("customName") and fname and fname != "Unknown":
-                spec.add_row("Standard Name", Text(fname, style=DIM))
+                spec.add_row("Standard Name", Text(fname, style=_S_DIM))
             if dt:
                 dt_name = DATA_TYPES.get(dt, {}).get("name", "")
                 dt_text = Text()
-                dt_text.append(dt, style=ORANGE)
+                dt_text.append(dt, style=_S_ORANGE)
                 if dt_name:
-                    dt_text.append(f"  ({self._tx(dt_name)})", style=DIM)
+                    dt_text.append(f"  ({self._tx(dt_name)})", style=_S_DIM)
                 # If OBX-5 resolved from OBX-2
                 if fld_def and fld_def["dt"] == "*" and seg.name == "OBX" and fld.field_num == 5:
-                    dt_text.append("  \u2190OBX-2", style=YELLOW)
+                    dt_text.append("  \u2190OBX-2", style=_S_YELLOW)
                 spec.add_row("Data Type", dt_text)
             if fld_def:
                 opt_map = {"R": "Required", "O": "Optional", "C": "Conditional", "B": "Backwards compat"}
@@ -852,20 +1158,20 @@ class HL7ViewerApp(App):
                     spec.add_row("Max Length", str(fld_def["len"]))
             # Full value
             val = self._tx(fld.raw_value) if fld.raw_value else "(empty)"
-            val_text = Text(val, style="#cdd6f4" if fld.raw_value else DIM)
+            val_text = Text(val, style=_S_TEXT if fld.raw_value else _S_DIM)
             # ValueMap lookup
             if p_fld and p_fld.get("valueMap") and fld.value:
                 mapped = p_fld["valueMap"].get(fld.value)
                 if mapped:
-                    val_text.append(f"  ({mapped})", style=TEAL)
+                    val_text.append(f"  ({mapped})", style=_S_TEAL)
             spec.add_row("Value", val_text)
             spec.add_row("HL7 Version", self.effective_version)
             # Profile description and notes
             if p_fld:
                 if p_fld.get("description"):
-                    spec.add_row("Profile Desc", Text(p_fld["description"], style=TEAL))
+                    spec.add_row("Profile Desc", Text(p_fld["description"], style=_S_TEAL))
                 if p_fld.get("notes"):
-                    spec.add_row("Notes", Text(p_fld["notes"], style=TEAL))
+                    spec.add_row("Notes", Text(p_fld["notes"], style=_S_TEAL))
             # Profile valueMap table
             if p_fld and p_fld.get("valueMap"):
                 vm = p_fld["valueMap"]
@@ -873,23 +1179,23 @@ class HL7ViewerApp(App):
                 for code, meaning in vm.items():
                     marker = "\u25b6 " if code == fld.value else "  "
                     vm_text.append(marker)
-                    vm_text.append(f"{code:<6}", style=YELLOW)
-                    vm_text.append(f"{meaning}\n", style="#cdd6f4")
+                    vm_text.append(f"{code:<6}", style=_S_YELLOW)
+                    vm_text.append(f"{meaning}\n", style=_S_TEXT)
                 # "Not in map" note if current value not in map
                 _, val_mis = _check_field_validation(p_fld, fld)
                 if val_mis:
                     test_val = fld.components[0].value if fld.components else fld.value
-                    vm_text.append(f"\u25cf {test_val} not in map", style=ORANGE)
+                    vm_text.append(f"\u25cf {test_val} not in map", style=_S_ORANGE)
                 spec.add_row("Value Map", vm_text)
             # Profile validation warnings
             if p_fld:
                 req_empty, val_mis = _check_field_validation(p_fld, fld)
                 if req_empty:
-                    spec.add_row("\u26a0 Required", Text("Required by profile but empty", style=ROSE))
+                    spec.add_row("\u26a0 Required", Text("Required by profile but empty", style=_S_ROSE))
                 if val_mis:
                     test_val = fld.components[0].value if fld.components else fld.value
                     expected = ", ".join(f"{k} ({v})" for k, v in p_fld["valueMap"].items())
-                    spec.add_row("\u26a0 Not in Map", Text(f"Value {test_val} not in map. Expected: {expected}", style=ORANGE))
+                    spec.add_row("\u26a0 Not in Map", Text(f"Value {test_val} not in map. Expected: {expected}", style=_S_ORANGE))
             spec_w.update(spec)
 
             # Components table
@@ -897,9 +1203,9 @@ class HL7ViewerApp(App):
             comp_defs = dt_info.get("components", [])
             if comp_defs:
                 ctable = Table(box=None, padding=(0, 1))
-                ctable.add_column("#", style=SAPPHIRE, width=3)
-                ctable.add_column("Name", style=GREEN, width=26)
-                ctable.add_column("Type", style=ORANGE, width=5)
+                ctable.add_column("#", style=_S_SAPPHIRE, width=3)
+                ctable.add_column("Name", style=_S_GREEN, width=26)
+                ctable.add_column("Type", style=_S_ORANGE, width=5)
                 ctable.add_column("Value")
 
                 for i, cd in enumerate(comp_defs):
@@ -911,13 +1217,13 @@ class HL7ViewerApp(App):
                             cval = c.value
                             break
                     disp_val = self._tx(cval) if cval else ""
-                    val_text = Text(disp_val, style="#cdd6f4") if cval else Text("", style=DIM)
+                    val_text = Text(disp_val, style=_S_TEXT) if cval else Text("", style=_S_DIM)
                     ctable.add_row(str(idx), self._tx(cd.get("name", "")), cd.get("dt", ""), val_text)
                 comp_w.update(ctable)
             elif fld.components:
                 # Components exist but no type definitions
                 ctable = Table(box=None, padding=(0, 1))
-                ctable.add_column("#", style=SAPPHIRE, width=3)
+                ctable.add_column("#", style=_S_SAPPHIRE, width=3)
                 ctable.add_column("Value")
                 for c in fld.components:
                     ctable.add_row(str(c.index), self._tx(c.value) if c.value else "")
@@ -928,7 +1234,7 @@ class HL7ViewerApp(App):
             # Repetitions
             if fld.repetitions and len(fld.repetitions) > 1:
                 rtable = Table(title="Repetitions", box=None, padding=(0, 1))
-                rtable.add_column("~#", style=YELLOW, width=4)
+                rtable.add_column("~#", style=_S_YELLOW, width=4)
                 rtable.add_column("Value")
                 for rep in fld.repetitions:
                     rtable.add_row(str(rep.index), self._tx(rep.value) if rep.value else "")
@@ -946,35 +1252,33 @@ class HL7ViewerApp(App):
 
             comp_name = self._tx(comp_def["name"]) if comp_def else "Unknown"
             comp_addr = f"{fld.address}.{comp.index}"
-            title_w.update(Text(f"{comp_addr} \u2014 {comp_name}", style=f"bold {SAPPHIRE}"))
-
-            spec = Table(show_header=False, box=None, padding=(0, 1))
-            spec.add_column("Key", style=DIM, width=14)
-            spec.add_column("Value")
-            spec.add_row("Segment", Text(seg.name, style=ROSE))
-            spec.add_row("Field", Text(fld.address, style=BLUE))
-            spec.add_row("Component", Text(comp_addr, style=SAPPHIRE))
+            title_w.update(Text(f"{comp_addr} \u2014 {comp_name}", style=_S_BOLD_SAPPHIRE))
+
+            spec = _spec_table()
+            spec.add_row("Segment", Text(seg.name, style=_S_ROSE))
+            spec.add_row("Field", Text(fld.address, style=_S_BLUE))
+            spec.add_row("Component", Text(comp_addr, style=_S_SAPPHIRE))
             if comp_name:
                 spec.add_row("Name", comp_name)
             if comp_dt:
                 dt_name = DATA_TYPES.get(comp_dt, {}).get("name", "")
                 dt_text = Text()
-                dt_text.append(comp_dt, style=ORANGE)
+                dt_text.append(comp_dt, style=_S_ORANGE)
                 if dt_name:
-                    dt_text.append(f"  ({self._tx(dt_name)})", style=DIM)
+                    dt_text.append(f"  ({self._tx(dt_name)})", style=_S_DIM)
                 spec.add_row("Data Type", dt_text)
             val = self._tx(comp.value) if comp.value else "(empty)"
-            spec.add_row("Value", Text(val, style="#cdd6f4" if comp.value else DIM))
+            spec.add_row("Value", Text(val, style=_S_TEXT if comp.value else _S_DIM))
             # Profile component description
             p_comp = get_profile_component(self._profile, seg.name, fld.field_num, comp.index)
             if p_comp and p_comp.get("description"):
-                spec.add_row("Profile Desc", Text(p_comp["description"], style=TEAL))
+                spec.add_row("Profile Desc", Text(p_comp["description"], style=_S_TEAL))
             spec_w.update(spec)
 
             # Subcomponents
             if comp.subcomponents and len(comp.subcomponents) > 1:
                 stable = Table(box=None, padding=(0, 1))
-                stable.add_column("&", style=DIM, width=3)
+                stable.add_column("&", style=_S_DIM, width=3)
                 stable.add_column("Value")
                 for si, sv in enumerate(comp.subcomponents, 1):
                     stable.add_row(str(si), self._tx(sv) if sv else "")
@@ -989,111 +1293,114 @@ class HL7ViewerApp(App):
         self.push_screen(HelpScreen())
 
     def action_search(self) -> None:
-        search_bar = self.query_one("#search-bar", Input)
+        search_bar = self._w_search
         search_bar.add_class("visible")
         search_bar.focus()
 
     def action_clear_search(self) -> None:
         # Close edit-bar if visible
-        edit_bar = self.query_one("#edit-bar", Input)
+        edit_bar = self._w_edit
         if edit_bar.has_class("visible"):
             edit_bar.remove_class("visible")
             edit_bar.value = ""
             self._editing_field_data = None
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+            self._w_tree.focus()
             return
         # Close send-bar if visible
-        send_bar = self.query_one("#send-bar", Input)
+        send_bar = self._w_send_bar
         if send_bar.has_class("visible"):
             send_bar.remove_class("visible")
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+            self._w_tree.focus()
             return
         # Close send split view if visible
         if self._send_view_active:
             self._close_send_view()
             return
         # Close file browser if visible
-        file_tree = self.query_one("#file-tree", HL7DirectoryTree)
+        file_tree = self._w_file_tree
         if file_tree.has_class("visible"):
             file_tree.remove_class("visible")
             if self._raw_view_active:
-                self.query_one("#raw-panel").add_class("visible")
+                self._w_raw_panel.add_class("visible")
             elif self._send_view_active:
-                self.query_one("#send-split").add_class("visible")
+                self._w_send_split.add_class("visible")
             else:
-                self.query_one("#main-split").remove_class("hidden")
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+                self._w_main.remove_class("hidden")
+            self._w_tree.focus()
             return
         # Close profile browser if visible
-        profile_tree = self.query_one("#profile-tree", ProfileDirectoryTree)
+        profile_tree = self._w_profile_tree
         if profile_tree.has_class("visible"):
             profile_tree.remove_class("visible")
             if self._raw_view_active:
-                self.query_one("#raw-panel").add_class("visible")
+                self._w_raw_panel.add_class("visible")
             elif self._send_view_active:
-                self.query_one("#send-split").add_class("visible")
+                self._w_send_split.add_class("visible")
             else:
-                self.query_one("#main-split").remove_class("hidden")
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+                self._w_main.remove_class("hidden")
+            self._w_tree.focus()
             return
         # Close search-bar if visible
-        search_bar = self.query_one("#search-bar", Input)
+        search_bar = self._w_search
         if search_bar.has_class("visible"):
             search_bar.remove_class("visible")
             search_bar.value = ""
-            self.search_query = ""
-            if self._search_debounce_timer is not None:
-                self._search_debounce_timer.stop()
-                self._search_debounce_timer = None
-            self._update_header()
-            self._build_tree()
+            self._apply_search("")
 
     _search_debounce_timer = None
 
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id == "search-bar":
-            self.search_query = event.value.strip()
+            query = event.value.strip()
+            if query == self.search_query:
+                return
+            # Header shows the query at once; the tree waits for a pause
+            self.search_query = query
             self._update_header()
-            if self._search_debounce_timer is not None:
-                self._search_debounce_timer.stop()
-            self._search_debounce_timer = self.set_timer(0.2, self._debounced_search_rebuild)
+            self._cancel_search_debounce()
+            self._search_debounce_timer = self.set_timer(0.12, self._flush_search)
 
-    def _debounced_search_rebuild(self) -> None:
-        """Rebuild tree after search debounce delay."""
+    def _cancel_search_debounce(self) -> None:
+        """Stop a pending debounced search, if any."""
+        if self._search_debounce_timer is not None:
+            self._search_debounce_timer.stop()
+            self._search_debounce_timer = None
+
+    def _flush_search(self) -> None:
+        """Rebuild the tree for the current query (debounce timer expiry)."""
         self._search_debounce_timer = None
         self._build_tree()
 
+    def _apply_search(self, query: str) -> None:
+        """Set the search query, then refresh header and tree."""
+        self._cancel_search_debounce()
+        self.search_query = query
+        self._update_header()
+        self._build_tree()
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input.id == "search-bar":
             # Close search bar, keep filter active; flush any pending debounce
             if self._search_debounce_timer is not None:
-                self._search_debounce_timer.stop()
-                self._search_debounce_timer = None
-                self._build_tree()
-            search_bar = self.query_one("#search-bar", Input)
+                self._cancel_search_debounce()
+                self._flush_search()
+            search_bar = self._w_search
             search_bar.remove_class("visible")
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+            self._w_tree.focus()
         elif event.input.id == "edit-bar":
             new_value = event.value
-            edit_bar = self.query_one("#edit-bar", Input)
+            edit_bar = self._w_edit
             edit_bar.remove_class("visible")
             edit_bar.value = ""
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+            self._w_tree.focus()
             if self._editing_field_data is not None:
                 self._apply_edit(new_value)
                 self._editing_field_data = None
         elif event.input.id == "send-bar":
             target = event.value.strip()
-            send_bar = self.query_one("#send-bar", Input)
+            send_bar = self._w_send_bar
             send_bar.remove_class("visible")
-            tree = self.query_one("#field-tree", Tree)
-            tree.focus()
+            self._w_tree.focus()
             if target:
                 self._last_send_target = target
                 self._show_send_pending(target)
@@ -1111,39 +1418,39 @@ class HL7ViewerApp(App):
 
     def action_open_file(self) -> None:
         """Toggle .hl7 file browser."""
-        file_tree = self.query_one("#file-tree", HL7DirectoryTree)
+        file_tree = self._w_file_tree
         if file_tree.has_class("visible"):
             # Close browser, restore previous view
             file_tree.remove_class("visible")
             if self._raw_view_active:
-                self.query_one("#raw-panel").add_class("visible")
+                self._w_raw_panel.add_class("visible")
             elif self._send_view_active:
-                self.query_one("#send-split").add_class("visible")
+                self._w_send_split.add_class("visible")
             else:
-                self.query_one("#main-split").remove_class("hidden")
-            self.query_one("#field-tree", Tree).focus()
+                self._w_main.remove_class("hidden")
+            self._w_tree.focus()
             return
         # Open browser
         file_tree.path = self._last_file_dir
-        self.query_one("#main-split").add_class("hidden")
-        self.query_one("#raw-panel").remove_class("visible")
-        self.query_one("#send-split").remove_class("visible")
+        self._w_main.add_class("hidden")
+        self._w_raw_panel.remove_class("visible")
+        self._w_send_split.remove_class("visible")
         file_tree.add_class("visible")
         file_tree.focus()
 
     def action_load_profile(self) -> None:
         """Toggle profile browser, or unload current profile."""
-        profile_tree = self.query_one("#profile-tree", ProfileDirectoryTree)
+        profile_tree = self._w_profile_tree
         if profile_tree.has_class("visible"):
             # Close browser, restore previous view
             profile_tree.remove_class("visible")
             if self._raw_view_active:
-                self.query_one("#raw-panel").add_class("visible")
+                self._w_raw_panel.add_class("visible")
             elif self._send_view_active:
-                self.query_one("#send-split").add_class("visible")
+                self._w_send_split.add_class("visible")
             else:
-                self.query_one("#main-split").remove_class("hidden")
-            self.query_one("#field-tree", Tree).focus()
+                self._w_main.remove_class("hidden")
+            self._w_tree.focus()
             return
         if self._profile:
             # Unload current profile
@@ -1156,23 +1463,31 @@ class HL7ViewerApp(App):
             return
         # Open profile browser
         profile_tree.path = self._last_profile_dir
-        self.query_one("#main-split").add_class("hidden")
-        self.query_one("#raw-panel").remove_class("visible")
-        self.query_one("#send-split").remove_class("visible")
+        self._w_main.add_class("hidden")
+        self._w_raw_panel.remove_class("visible")
+        self._w_send_split.remove_class("visible")
         profile_tree.add_class("visible")
         profile_tree.focus()
 
+    @work(thread=True, exclusive=True, group="profile")
     def _load_profile_path(self, path):
-        """Load a profile JSON file by path."""
+        """Load a profile JSON file by path in a worker thread."""
         from .profile import load_profile
         try:
             profile = load_profile(path)
         except (OSError, IOError, ValueError) as e:
-            self.notify(f"Error: {e}", severity="error", timeout=3)
+            self.call_from_thread(self.notify, f"Error: {e}", severity="error", timeout=3)
             return
         except Exception as e:
-            self.notify(f"Invalid JSON: {e}", severity="error", timeout=3)
+            self.call_from_thread(
+                self.notify, f"Invalid JSON: {e}", severity="error", timeout=3)
             return
+        if get_current_worker().is_cancelled:
+            return
+        self.call_from_thread(self._finish_load_profile, path, profile)
+
+    def _finish_load_profile(self, path, profile):
+        """Apply a profile loaded by _load_profile_path (runs on the UI thread)."""
         self._profile = profile
         self._last_profile_dir = os.path.dirname(os.path.abspath(path))
         self._update_header()
@@ -1183,33 +1498,56 @@ class HL7ViewerApp(App):
 
     def action_paste_clipboard(self) -> None:
         """Read HL7 from clipboard and load it."""
+        self._paste_clipboard()
+
+    @work(thread=True, exclusive=True, group="paste")
+    def _paste_clipboard(self):
+        """Read and parse the clipboard in a worker thread, then load it."""
         try:
             result = subprocess.run(
                 ['xclip', '-o', '-selection', 'clipboard'],
                 capture_output=True, timeout=5
             )
-            if result.returncode != 0:
-                self.notify("xclip failed", severity="error", timeout=3)
-                return
-            raw = result.stdout
-            if not raw.strip():
-                self.notify("Clipboard empty", severity="warning", timeout=2)
-                return
-            enc = detect_encoding(raw)
-            text = raw.decode(enc['decoder_label'])
-            parsed = parse_hl7(text)
-            if not parsed:
-                self.notify("No HL7 segments in clipboard", severity="error", timeout=3)
-                return
-            self._load_message(parsed, "(clipboard)", enc)
-            self.notify("Loaded from clipboard", timeout=2)
         except FileNotFoundError:
-            self.notify("xclip not found", severity="error", timeout=3)
+            self.call_from_thread(
+                self.notify, "xclip not found", severity="error", timeout=3)
+            return
         except subprocess.TimeoutExpired:
-            self.notify("xclip timed out", severity="error", timeout=3)
+            self.call_from_thread(
+                self.notify, "xclip timed out", severity="error", timeout=3)
+            return
+        if result.returncode != 0:
+            self.call_from_thread(self.notify, "xclip failed", severity="error", timeout=3)
+            return
+        raw = result.stdout
+        if not raw.strip():
+            self.call_from_thread(
+                self.notify, "Clipboard empty", severity="warning", timeout=2)
+            return
+        enc = detect_encoding(raw)
+        text = raw.decode(enc['decoder_label'])
+        parsed = parse_hl7(text)
+        if not parsed:
+            self.call_from_thread(
+                self.notify, "No HL7 segments in clipboard", severity="error", timeout=3)
+            return
+        if get_current_worker().is_cancelled:
+            return
+        self.call_from_thread(self._finish_paste_clipboard, parsed, enc)
+
+    def _finish_paste_clipboard(self, parsed, enc):
+        """Load a message parsed by _paste_clipboard (runs on the UI thread)."""
+        self._load_message(parsed, "(clipboard)", enc)
+        self.notify("Loaded from clipboard", timeout=2)
 
     def action_toggle_anon(self) -> None:
         """Toggle anonymization on/off."""
+        if self._anon_pending:
+            # Pressed again before the worker finished: cancel
+            self._anon_pending = False
+            self.workers.cancel_group(self, "anon")
+            self.notify("Anonymization cancelled", timeout=2)
+            return
         if not self._anon_active and self._modified:
             self.notify(
                 "Cannot anonymize: message has unsaved edits. "
@@ -1220,15 +1558,50 @@ class HL7ViewerApp(App):
         if self._anon_active:
             # Restore original
             self._anon_active = False
-            self._anon_parsed = None
-            self.parsed = self.original_parsed
+            self._show_parsed(self.original_parsed)
         else:
-            # Anonymize
+            self._request_anonymized()
+
+    def _request_anonymized(self) -> None:
+        """Show the anonymized copy for the current name pool.
+
+        Copies are cached per pool until a new message is loaded, so toggling
+        is instant and shows the same fake identities each time. A missing
+        copy is built in a worker thread and shown when it arrives.
+        """
+        anon = self._anon_cache.get(self._anon_non_ascii)
+        if anon is not None:
+            self._anon_pending = False
             self._anon_active = True
-            self._anon_parsed = anonymize_message(
-                self.original_parsed, use_non_ascii=self._anon_non_ascii
-            )
-            self.parsed = self._anon_parsed
+            self._show_parsed(anon)
+            return
+        self._anon_pending = True
+        self.notify("Anonymizing\u2026", timeout=2)
+        self._anonymize_worker(self.original_parsed, self._anon_non_ascii)
+
+    @work(thread=True, exclusive=True, group="anon")
+    def _anonymize_worker(self, original, non_ascii):
+        """Anonymize original in a worker thread, then hand it to the UI."""
+        anon = anonymize_message(original, use_non_ascii=non_ascii)
+        if get_current_worker().is_cancelled:
+            return
+        self.call_from_thread(self._finish_anonymize, original, non_ascii, anon)
+
+    def _finish_anonymize(self, original, non_ascii, anon):
+        """Cache and show a copy built by _anonymize_worker (UI thread)."""
+        if original is not self.original_parsed or self._modified:
+            # Message was replaced or edited while the worker ran
+            self._anon_pending = False
+            return
+        self._anon_cache[non_ascii] = anon
+        if self._anon_pending and non_ascii == self._anon_non_ascii:
+            self._anon_pending = False
+            self._anon_active = True
+            self._show_parsed(anon)
+
+    def _show_parsed(self, parsed) -> None:
+        """Display parsed in place of the current message (anon toggles)."""
+        self.parsed = parsed
         self._current_node_data = None
         self._update_header()
         self._refresh_view()
@@ -1237,14 +1610,8 @@ class HL7ViewerApp(App):
     def action_toggle_non_ascii(self) -> None:
         """Toggle ASCII/Estonian name pool, re-anonymize if active."""
         self._anon_non_ascii = not self._anon_non_ascii
-        if self._anon_active:
-            self._anon_parsed = anonymize_message(
-                self.original_parsed, use_non_ascii=self._anon_non_ascii
-            )
-            self.parsed = self._anon_parsed
-            self._current_node_data = None
-            self._refresh_view()
-            self._clear_detail()
+        if self._anon_active or self._anon_pending:
+            self._request_anonymized()
         self._update_header()
         pool = "Estonian" if self._anon_non_ascii else "ASCII"
         self.notify(f"Name pool: {pool}", timeout=2)
@@ -1253,15 +1620,24 @@ class HL7ViewerApp(App):
         """Rebuild whichever view (tree or raw) is currently active."""
         if self._raw_view_active:
             self._build_raw_view()
+            self._tree_dirty = True
         else:
             self._build_tree()
 
+    def _show_main_split(self) -> None:
+        """Unhide the tree/detail split, rebuilding the tree if it went stale."""
+        self._w_main.remove_class("hidden")
+        if self._tree_dirty:
+            self._build_tree()
+
     def action_toggle_transliterate(self) -> None:
         """Toggle non-ASCII transliteration in display."""
         self._transliterate_active = not self._transliterate_active
+        self._tx_cache = {}
         self._update_header()
         if self._raw_view_active:
             self._build_raw_view()
+            self._tree_dirty = True
         else:
             self._build_tree()
             if self._current_node_data:
@@ -1270,92 +1646,91 @@ class HL7ViewerApp(App):
     def action_toggle_raw(self) -> None:
         """Toggle between tree view and raw message view."""
         self._raw_view_active = not self._raw_view_active
-        main_split = self.query_one("#main-split")
-        raw_panel = self.query_one("#raw-panel")
+        main_split = self._w_main
+        raw_panel = self._w_raw_panel
         if self._raw_view_active:
             main_split.add_class("hidden")
             raw_panel.add_class("visible")
             self._build_raw_view()
         else:
             raw_panel.remove_class("visible")
-            main_split.remove_class("hidden")
+            self._show_main_split()
         self._update_header()
 
     def _build_raw_text(self, parsed) -> Text:
         """Build highlighted raw message Text from a ParsedMessage."""
-        output = Text()
-        for seg in parsed.segments:
-            raw_line = self._tx(seg.raw_line)
-            fields = raw_line.split("|")
-            seg_name = fields[0] if fields else ""
+        return self._highlight_raw_lines(seg.raw_line for seg in parsed.segments)
 
-            # Segment name
-            output.append(seg_name, style=f"bold {ROSE}")
-
-            if seg_name == "MSH":
-                # MSH-1 is the | separator itself
-                output.append("|", style=DIM)
-                # MSH-2: encoding characters
-                if len(fields) > 1:
-                    output.append(fields[1], style=YELLOW)
-                # MSH-3 onwards
-                for i in range(2, len(fields)):
-                    output.append("|", style=DIM)
-                    self._append_raw_field(output, fields[i])
-            else:
-                for i in range(1, len(fields)):
-                    output.append("|", style=DIM)
-                    self._append_raw_field(output, fields[i])
-            output.append("\n")
+    def _highlight_raw_lines(self, lines) -> Text:
+        """Build highlighted raw message Text from segment lines.
+
+        The plain text is the lines as-is, so spans are laid out directly
+        from offsets instead of appending thousands of small pieces.
+        """
+        chunks = []
+        spans = []
+        add = spans.append
+        pos = 0
+        for raw_line in lines:
+            raw_line = self._tx(raw_line)
+            chunks.append(raw_line)
+            seg_name, sep, rest = raw_line.partition("|")
 
-        return output
+            # Segment name
+            start = pos + len(seg_name)
+            if seg_name:
+                add(Span(pos, start, _S_BOLD_ROSE))
+
+            if sep:
+                add(Span(start, start + 1, _S_DIM))
+                start += 1
+                if seg_name == "MSH":
+                    # MSH-1 is the | separator itself; MSH-2 holds the
+                    # encoding characters, so it is not split on them
+                    enc_chars, sep, rest = rest.partition("|")
+                    if enc_chars:
+                        add(Span(start, start + len(enc_chars), _S_YELLOW))
+                        start += len(enc_chars)
+                    if sep:
+                        add(Span(start, start + 1, _S_DIM))
+                        start += 1
+                for m in _RAW_TOKEN_RE.finditer(rest):
+                    tok_start, tok_end = m.span()
+                    style = _RAW_SEP_STYLES.get(m.group(), _S_TEXT)
+                    add(Span(start + tok_start, start + tok_end, style))
+            pos += len(raw_line) + 1
+
+        plain = "\n".join(chunks) + "\n" if chunks else ""
+        return Text(plain, spans=spans)
+
+    def _cached_raw_text(self, parsed) -> Text:
+        """Highlighted raw Text for parsed, reused until the message changes.
+
+        Callers must not mutate the result (append_text copies it).
+        """
+        key = (id(parsed), self._transliterate_active)
+        cached = self._raw_text_cache.get(key)
+        # Holding the message in the entry keeps its id from being reused
+        if cached is not None and cached[0] is parsed:
+            return cached[1]
+        text = self._build_raw_text(parsed)
+        self._raw_text_cache[key] = (parsed, text)
+        return text
 
     def _build_raw_view(self) -> None:
         """Build the highlighted raw message view."""
-        raw_w = self.query_one("#raw-content", Static)
-        raw_w.update(self._build_raw_text(self.parsed))
-
-    def _append_raw_field(self, text, value):
-        """Append a field value to raw view with component highlighting."""
-        if not value:
-            return
-        # Split on ^ for component highlighting, but keep ~ and & visible
-        if "~" in value:
-            reps = value.split("~")
-            for ri, rep in enumerate(reps):
-                if ri > 0:
-                    text.append("~", style=TEAL)
-                self._append_raw_components(text, rep)
-        else:
-            self._append_raw_components(text, value)
-
-    def _append_raw_components(self, text, value):
-        """Append component-split value with ^ and & highlighting."""
-        if "^" not in value:
-            text.append(value, style="#cdd6f4")
-            return
-        parts = value.split("^")
-        for ci, comp in enumerate(parts):
-            if ci > 0:
-                text.append("^", style=DIM)
-            if "&" in comp:
-                subs = comp.split("&")
-                for si, sub in enumerate(subs):
-                    if si > 0:
-                        text.append("&", style=DIM)
-                    text.append(sub, style="#cdd6f4")
-            else:
-                text.append(comp, style="#cdd6f4")
+        self._w_raw_content.update(self._cached_raw_text(self.parsed))
 
     def _clear_detail(self):
         """Clear all detail panel widgets."""
-        self.query_one("#detail-title", Static).update("")
-        self.query_one("#spec-section", Static).update("")
-        self.query_one("#comp-section", Static).update("")
-        self.query_one("#rep-section", Static).update("")
+        self._detail_key = None
+        self._w_title.update("")
+        self._w_spec.update("")
+        self._w_comp.update("")
+        self._w_rep.update("")
 
     def action_copy_field(self) -> None:
-        """Copy current field value to clipboard via xclip."""
+        """Copy current field value to clipboard via xclip (or OSC 52)."""
         if not self._current_node_data:
             self.notify("No field selected", severity="warning", timeout=2)
             return
@@ -1371,19 +1746,35 @@ class HL7ViewerApp(App):
         if not val:
             self.notify("Empty value", severity="warning", timeout=2)
             return
+        addr = ""
+        if data["type"] == "field":
+            addr = data["field"].address
+        elif data["type"] == "component":
+            addr = f"{data['field'].address}.{data['component'].index}"
+        self._copy_with_xclip(val, addr)
+
+    @work(thread=True, exclusive=True, group="copy")
+    def _copy_with_xclip(self, val, addr):
+        """Run xclip in a worker thread so the fork never stalls the UI."""
         try:
             subprocess.run(
                 ["xclip", "-selection", "clipboard"],
                 input=val.encode(), check=True, timeout=5,
             )
-            addr = ""
-            if data["type"] == "field":
-                addr = data["field"].address
-            elif data["type"] == "component":
-                addr = f"{data['field'].address}.{data['component'].index}"
-            self.notify(f"Copied {addr}", timeout=2)
-        except (FileNotFoundError, subprocess.SubprocessError):
-            self.notify("xclip not available", severity="error", timeout=2)
+        except FileNotFoundError:
+            # No xclip (e.g. over SSH): let the terminal set the clipboard
+            self.call_from_thread(self._copy_with_terminal, val, addr)
+            return
+        except subprocess.SubprocessError:
+            self.call_from_thread(
+                self.notify, "xclip not available", severity="error", timeout=2)
+            return
+        self.call_from_thread(self.notify, f"Copied {addr}", timeout=2)
+
+    def _copy_with_terminal(self, val, addr):
+        """Copy via the terminal's OSC 52 clipboard (runs on the UI thread)."""
+        self.copy_to_clipboard(val)
+        self.notify(f"Copied {addr} (terminal clipboard)", timeout=2)
 
     def action_edit_field(self) -> None:
         """Edit the currently highlighted field or component."""
@@ -1400,7 +1791,7 @@ class HL7ViewerApp(App):
             return
 
         self._editing_field_data = data
-        edit_bar = self.query_one("#edit-bar", Input)
+        edit_bar = self._w_edit
 
         if data["type"] == "field":
             fld = data["field"]
@@ -1429,25 +1820,17 @@ class HL7ViewerApp(App):
             reparse_field(fld, new_value)
             seg.raw_line = rebuild_raw_line(seg.name, seg.fields)
         elif data["type"] == "component":
-            comp = data["component"]
-            fld = data["field"]
-            comp.value = new_value
-            # Rebuild field raw_value from all components
-            comp_values = []
-            for c in fld.components:
-                comp_values.append(c.value)
-            new_raw = "^".join(comp_values)
-            # If field has repetitions, rebuild with repetitions
-            if fld.repetitions:
-                # Update first repetition's components
-                fld.repetitions[0].value = new_raw
-                fld.repetitions[0].components = fld.components
-                rep_values = [r.value for r in fld.repetitions]
-                new_raw = "~".join(rep_values)
-            reparse_field(fld, new_raw)
+            replace_component(data["field"], data["component"].index, new_value)
             seg.raw_line = rebuild_raw_line(seg.name, seg.fields)
 
         self._modified = True
+        self._obx5_cache.pop(id(seg), None)
+        self._search_cache = {}
+        self._raw_text_cache = {}
+        self._profile_counts = None
+        if not self._anon_active:
+            # Original changed under any cached anonymized copies
+            self._anon_cache = {}
         self._update_header()
         self._build_tree()
         # Refresh detail panel
@@ -1456,7 +1839,7 @@ class HL7ViewerApp(App):
 
     def action_send(self) -> None:
         """Show send target input bar."""
-        send_bar = self.query_one("#send-bar", Input)
+        send_bar = self._w_send_bar
         send_bar.value = self._last_send_target
         send_bar.add_class("visible")
         send_bar.focus()
@@ -1477,37 +1860,39 @@ class HL7ViewerApp(App):
         display_target = f"{host}:{port}" if host else target
 
         # Show send split, hide others
-        self.query_one("#main-split").add_class("hidden")
-        self.query_one("#raw-panel").remove_class("visible")
-        self.query_one("#send-split").add_class("visible")
+        self._w_main.add_class("hidden")
+        self._w_raw_panel.remove_class("visible")
+        self._w_send_split.add_class("visible")
 
         # Left pane: sent message
-        sent_w = self.query_one("#send-sent-content", Static)
-        sent_header = Text()
-        sent_header.append("SENT MESSAGE\n", style=f"bold {GREEN}")
-        sent_header.append("─" * 40 + "\n", style=DIM)
-        sent_header.append_text(self._build_raw_text(self.parsed))
-        sent_w.update(sent_header)
+        self._render_sent_pane()
 
         # Right pane: sending indicator
-        resp_w = self.query_one("#send-response-content", Static)
+        resp_w = self._w_response_content
         pending = Text()
         pending.append(
             f"Sending to {display_target} ({tls_label.strip() or 'plain'})...\n",
-            style=f"bold {YELLOW}")
+            style=_S_BOLD_YELLOW)
         resp_w.update(pending)
 
         # Scroll containers to top
-        self.query_one("#send-sent").scroll_home(animate=False)
-        self.query_one("#send-response").scroll_home(animate=False)
+        self._w_sent.scroll_home(animate=False)
+        self._w_response.scroll_home(animate=False)
 
         # Update header
-        header_widget = self.query_one("#msg-header", Static)
-        msg_type = self.parsed.message_type or "???"
-        parts = [f"[SENDING\u2192{display_target}{tls_label}]", msg_type]
-        if self.filename:
-            parts.append(self.filename)
-        header_widget.update(" \u2502 ".join(parts))
+        self._show_send_header(f"[SENDING\u2192{display_target}{tls_label}]")
+
+    def _render_sent_pane(self) -> None:
+        """Show the sent message, unless the pane already shows this text."""
+        raw_text = self._cached_raw_text(self.parsed)
+        # The raw-text cache hands back the same object until the message,
+        # an edit or transliteration changes it
+        if raw_text is self._sent_pane_text:
+            return
+        self._sent_pane_text = raw_text
+        sent_header = _SENT_HEADER.copy()
+        sent_header.append_text(raw_text)
+        self._w_sent_content.update(sent_header)
 
     def _parse_send_input(self, target):
         """Parse send bar input into (host_port, tls_config).
@@ -1560,7 +1945,7 @@ class HL7ViewerApp(App):
         display_target = f"{host}:{port}"
         wire_text = reconstruct_message(self.parsed)
         try:
-            response_text, elapsed_ms = mllp_send(
+            response_text, elapsed_ms = self._mllp_pool.send(
                 host, port, wire_text, tls_config=tls_config)
         except (ConnectionError, TimeoutError, OSError) as e:
             self.call_from_thread(self._show_send_result, {
@@ -1574,14 +1959,10 @@ class HL7ViewerApp(App):
             'target': display_target,
             'elapsed_ms': elapsed_ms,
             'response_raw': response_text,
+            # Parsed on demand by action_load_response
+            'response_parsed': None,
             'tls_config': tls_config,
         }
-        if response_text:
-            resp_parsed = parse_hl7(response_text)
-            result['response_parsed'] = resp_parsed
-        else:
-            result['response_parsed'] = None
-
         self.call_from_thread(self._show_send_result, result)
 
     def _show_send_result(self, result: dict) -> None:
@@ -1590,49 +1971,43 @@ class HL7ViewerApp(App):
         self._send_view_active = True
 
         # Hide other views, show send split
-        self.query_one("#main-split").add_class("hidden")
-        self.query_one("#raw-panel").remove_class("visible")
-        self.query_one("#send-split").add_class("visible")
+        self._w_main.add_class("hidden")
+        self._w_raw_panel.remove_class("visible")
+        self._w_send_split.add_class("visible")
 
         # Scroll containers to top so new result is visible
-        self.query_one("#send-sent").scroll_home(animate=False)
-        self.query_one("#send-response").scroll_home(animate=False)
+        self._w_sent.scroll_home(animate=False)
+        self._w_response.scroll_home(animate=False)
 
         # Left pane: sent message
-        sent_w = self.query_one("#send-sent-content", Static)
-        sent_header = Text()
-        sent_header.append("SENT MESSAGE\n", style=f"bold {GREEN}")
-        sent_header.append("─" * 40 + "\n", style=DIM)
-        sent_text = self._build_raw_text(self.parsed)
-        sent_header.append_text(sent_text)
-        sent_w.update(sent_header)
+        self._render_sent_pane()
 
         # Right pane: response or error
-        resp_w = self.query_one("#send-response-content", Static)
+        resp_w = self._w_response_content
         target = result.get('target', '?')
         error = result.get('error')
 
         if error:
-            resp_output = Text()
-            resp_output.append("ERROR\n", style="bold red")
-            resp_output.append("─" * 40 + "\n", style=DIM)
-            resp_output.append(error, style="red")
+            resp_output = _ERROR_HEADER.copy()
+            resp_output.append(error, style=_S_RED)
             resp_w.update(resp_output)
         else:
             elapsed = result.get('elapsed_ms', 0)
             resp_output = Text()
             resp_output.append(f"RESPONSE from {target} ({elapsed}ms)\n",
-                               style=f"bold {GREEN}")
-            resp_output.append("─" * 40 + "\n", style=DIM)
-            resp_parsed = result.get('response_parsed')
-            if resp_parsed:
-                resp_output.append_text(self._build_raw_text(resp_parsed))
+                               style=_S_BOLD_GREEN)
+            resp_output.append(_SEND_RULE, style=_S_DIM)
+            resp_lines = normalize_message(result.get('response_raw') or "")
+            if resp_lines:
+                # Highlighting only needs segment lines, not a full parse
+                resp_output.append_text(self._highlight_raw_lines(
+                    line for line in resp_lines if len(line.partition("|")[0]) >= 2))
                 resp_output.append("\n")
-                resp_output.append("Press l to load response into viewer", style=DIM)
+                resp_output.append("Press l to load response into viewer", style=_S_DIM)
             elif result.get('response_raw'):
-                resp_output.append(result['response_raw'], style="#cdd6f4")
+                resp_output.append(result['response_raw'], style=_S_TEXT)
             else:
-                resp_output.append("(empty response)", style=DIM)
+                resp_output.append("(empty response)", style=_S_DIM)
             resp_w.update(resp_output)
 
         # Update header
@@ -1649,27 +2024,30 @@ class HL7ViewerApp(App):
                                 tls_config=None):
         """Update header to show send status."""
         tls_label = self._tls_label(tls_config)
-        header_widget = self.query_one("#msg-header", Static)
-        parts = []
         if error:
-            parts.append(f"[SEND FAILED\u2192{target}]")
+            self._show_send_header(f"[SEND FAILED\u2192{target}]")
         else:
-            parts.append(f"[SENT\u2192{target}{tls_label} {elapsed_ms}ms]")
-        msg_type = self.parsed.message_type or "???"
-        parts.append(msg_type)
+            self._show_send_header(f"[SENT\u2192{target}{tls_label} {elapsed_ms}ms]")
+
+    def _show_send_header(self, banner: str) -> None:
+        """Replace the header with a send banner, message type and file."""
+        # Supersedes any pending refresh; next _update_header redraws fully
+        self._header_flush_pending = False
+        self._header_text = None
+        parts = [banner, self.parsed.message_type or "???"]
         if self.filename:
             parts.append(self.filename)
-        header_widget.update(" \u2502 ".join(parts))
+        self._w_header.update(" \u2502 ".join(parts))
 
     def _close_send_view(self) -> None:
         """Close the send split view and restore previous view."""
         self._send_view_active = False
         self._send_result = None
-        self.query_one("#send-split").remove_class("visible")
+        self._w_send_split.remove_class("visible")
         if self._raw_view_active:
-            self.query_one("#raw-panel").add_class("visible")
+            self._w_raw_panel.add_class("visible")
         else:
-            self.query_one("#main-split").remove_class("hidden")
+            self._show_main_split()
         self._update_header()
 
     def action_load_response(self) -> None:
@@ -1677,6 +2055,9 @@ class HL7ViewerApp(App):
         if not self._send_view_active or not self._send_result:
             return
         resp_parsed = self._send_result.get('response_parsed')
+        if resp_parsed is None and self._send_result.get('response_raw'):
+            resp_parsed = parse_hl7(self._send_result['response_raw'])
+            self._send_result['response_parsed'] = resp_parsed
         if not resp_parsed:
             self.notify("No parsed response to load", severity="warning", timeout=2)
             return
@@ -1688,20 +2069,20 @@ class HL7ViewerApp(App):
         """Load selected file from a file browser."""
         path = str(event.path)
         # Determine which tree fired the event
-        profile_tree = self.query_one("#profile-tree", ProfileDirectoryTree)
+        profile_tree = self._w_profile_tree
         if profile_tree.has_class("visible"):
             # Profile file selected
             profile_tree.remove_class("visible")
-            self.query_one("#main-split").remove_class("hidden")
+            self._w_main.remove_class("hidden")
             self._load_profile_path(path)
-            self.query_one("#field-tree", Tree).focus()
+            self._w_tree.focus()
             return
         # HL7 file selected
-        file_tree = self.query_one("#file-tree", HL7DirectoryTree)
+        file_tree = self._w_file_tree
         file_tree.remove_class("visible")
-        self.query_one("#main-split").remove_class("hidden")
+        self._w_main.remove_class("hidden")
         self._open_file_path(path)
-        self.query_one("#field-tree", Tree).focus()
+        self._w_tree.focus()
 
     def action_go_back(self) -> None:
         """Navigate to the previous message in history."""
@@ -1722,14 +2103,18 @@ class HL7ViewerApp(App):
     def _restore_from_history(self) -> None:
         """Restore a message from history by current index."""
         parsed, filename, enc_info = self._history[self._history_idx]
+        if isinstance(parsed, str):
+            # Batch member seeded as raw text: parse on first visit
+            parsed = parse_hl7(parsed)
+            self._history[self._history_idx] = (parsed, filename, enc_info)
         self._restoring_history = True
         self._load_message(parsed, filename, enc_info)
         self._restoring_history = False
 
     def action_cursor_down(self) -> None:
-        tree = self.query_one("#field-tree", Tree)
+        tree = self._w_tree
         tree.action_cursor_down()
 
     def action_cursor_up(self) -> None:
-        tree = self.query_one("#field-tree", Tree)
+        tree = self._w_tree
         tree.action_cursor_up()
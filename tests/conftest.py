@@ -1,4 +1,8 @@
-"""Shared fixtures: parsed sample messages and profile."""
+"""Shared fixtures: parsed sample messages and profile.
+
+Session-scoped, so each sample is read and parsed once. Tests that mutate
+a message must parse their own copy from the matching ``*_raw`` fixture.
+"""
 
 from pathlib import Path
 
@@ -11,46 +15,51 @@ SAMPLES_DIR = Path(__file__).parent.parent / "samples"
 PROFILES_DIR = Path(__file__).parent.parent / "profiles"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def adt_raw():
     return (SAMPLES_DIR / "adt-a01-admit-v25.hl7").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def adt_parsed(adt_raw):
     return parse_hl7(adt_raw)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def adt_pid(adt_parsed):
+    return adt_parsed.segments_by_name["PID"][0]
+
+
+@pytest.fixture(scope="session")
 def orm_raw():
     return (SAMPLES_DIR / "orm-o01-order-v23.hl7").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def orm_parsed(orm_raw):
     return parse_hl7(orm_raw)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def oru_raw():
     return (SAMPLES_DIR / "oru-r01-lab-v25.hl7").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def oru_parsed(oru_raw):
     return parse_hl7(oru_raw)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def oru_v28_raw():
     return (SAMPLES_DIR / "oru-r01-lab-v28.hl7").read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def oru_v28_parsed(oru_v28_raw):
     return parse_hl7(oru_v28_raw)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_profile():
     return load_profile(PROFILES_DIR / "sample-profile.json")
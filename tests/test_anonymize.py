@@ -5,35 +5,35 @@ import copy
 import pytest
 
 from hl7view.anonymize import anonymize_message, transliterate
-from hl7view.parser import parse_hl7
+from hl7view.parser import parse_hl7, replace_component
 
 
 def _field(seg, num):
-    return next(f for f in seg.fields if f.field_num == num)
+    return seg.fields_by_num[num]
 
 
 def _seg(parsed, name):
-    return next(s for s in parsed.segments if s.name == name)
+    return parsed.segments_by_name[name][0]
 
 
 def _pid(parsed):
     return _seg(parsed, "PID")
 
 
-def test_anonymize_changes_patient_name(adt_parsed):
-    original_name = _field(_pid(adt_parsed), 5).value
+def test_anonymize_changes_patient_name(adt_parsed, adt_pid):
+    original_name = _field(adt_pid, 5).value
     anon = anonymize_message(adt_parsed)
     assert _field(_pid(anon), 5).value != original_name
 
 
-def test_anonymize_changes_patient_id(adt_parsed):
-    original_id = _field(_pid(adt_parsed), 3).value
+def test_anonymize_changes_patient_id(adt_parsed, adt_pid):
+    original_id = _field(adt_pid, 3).value
     anon = anonymize_message(adt_parsed)
     assert _field(_pid(anon), 3).value != original_id
 
 
-def test_anonymize_changes_dob(adt_parsed):
-    original_dob = _field(_pid(adt_parsed), 7).value
+def test_anonymize_changes_dob(adt_parsed, adt_pid):
+    original_dob = _field(adt_pid, 7).value
     anon = anonymize_message(adt_parsed)
     new_dob = _field(_pid(anon), 7).value
     assert new_dob != original_dob
@@ -42,8 +42,8 @@ def test_anonymize_changes_dob(adt_parsed):
     assert new_dob[:4].isdigit()
 
 
-def test_anonymize_changes_phone(adt_parsed):
-    original_phone = _field(_pid(adt_parsed), 13).raw_value
+def test_anonymize_changes_phone(adt_parsed, adt_pid):
+    original_phone = _field(adt_pid, 13).raw_value
     anon = anonymize_message(adt_parsed)
     assert _field(_pid(anon), 13).raw_value != original_phone
 
@@ -51,8 +51,8 @@ def test_anonymize_changes_phone(adt_parsed):
 def test_anonymize_preserves_structure(adt_parsed):
     anon = anonymize_message(adt_parsed)
     assert len(anon.segments) == len(adt_parsed.segments)
-    assert [s.name for s in anon.segments] == [s.name for s in adt_parsed.segments]
-    for orig_seg, anon_seg in zip(adt_parsed.segments, anon.segments):
+    for orig_seg, anon_seg in zip(adt_parsed.segments, anon.segments, strict=True):
+        assert anon_seg.name == orig_seg.name
         assert len(anon_seg.fields) == len(orig_seg.fields)
 
 
@@ -72,6 +72,13 @@ def test_anonymize_does_not_mutate_original(adt_parsed):
     assert _field(_pid(adt_parsed), 3).value == original_id
 
 
+def test_anonymize_result_shares_no_components(adt_parsed):
+    anon = anonymize_message(adt_parsed)
+    # MSH is not anonymized, so its fields are copies of the original's
+    replace_component(_field(_seg(anon, "MSH"), 9), 2, "A08")
+    assert _field(_seg(adt_parsed, "MSH"), 9).components[1].value == "A01"
+
+
 def test_transliterate():
     assert transliterate("\u00d5ispuu") == "Oispuu"     # Õ -> O
     assert transliterate("K\u00fclli") == "Kulli"       # ü -> u
@@ -79,33 +86,34 @@ def test_transliterate():
     assert transliterate("Hello") == "Hello"            # pure ASCII passthrough
 
 
+def test_transliterate_beyond_nfkd():
+    assert transliterate("Stra\u00dfe") == "Strasse"    # ß -> ss
+    assert transliterate("\u00c6sa") == "AEsa"          # Æ -> AE
+    assert transliterate("\u00de\u00f3r") == "Thor"     # Þ -> Th
+    assert transliterate("\u0141\u00f8d\u017a") == "Lodz"  # Ł, ø have no NFKD form
+    assert transliterate("\u674e") == "?"               # no ASCII form
+
+
 # ---------------------------------------------------------------------------
 # NK1 tests (using ADT sample which has NK1 segment)
 # ---------------------------------------------------------------------------
 
-def test_anonymize_nk1_name(adt_parsed):
-    original = _field(_seg(adt_parsed, "NK1"), 2).value
-    anon = anonymize_message(adt_parsed)
-    assert _field(_seg(anon, "NK1"), 2).value != original
-
-
-def test_anonymize_nk1_address(adt_parsed):
-    original = _field(_seg(adt_parsed, "NK1"), 4).raw_value
-    anon = anonymize_message(adt_parsed)
-    assert _field(_seg(anon, "NK1"), 4).raw_value != original
-
-
-def test_anonymize_nk1_phone(adt_parsed):
-    original = _field(_seg(adt_parsed, "NK1"), 5).raw_value
+@pytest.mark.parametrize("field_num, attr", [
+    (2, "value"),       # name
+    (4, "raw_value"),   # address
+    (5, "raw_value"),   # phone
+])
+def test_anonymize_nk1_field(adt_parsed, field_num, attr):
+    original = getattr(_field(_seg(adt_parsed, "NK1"), field_num), attr)
     anon = anonymize_message(adt_parsed)
-    assert _field(_seg(anon, "NK1"), 5).raw_value != original
+    assert getattr(_field(_seg(anon, "NK1"), field_num), attr) != original
 
 
 # ---------------------------------------------------------------------------
 # PID extended fields (6, 18, 21, 23) — inline fixture
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def pid_extended_parsed():
     msg = (
         "MSH|^~\\&|SYS|HOSP|RCV|HOSP|20260101120000||ADT^A01|1|P|2.5\r"
@@ -148,7 +156,7 @@ def test_anonymize_pid_birth_place(pid_extended_parsed):
 # GT1 tests — inline fixture
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def gt1_parsed():
     msg = (
         "MSH|^~\\&|SYS|HOSP|RCV|HOSP|20260101120000||ADT^A01|1|P|2.5\r"
@@ -159,28 +167,16 @@ def gt1_parsed():
     return parse_hl7(msg)
 
 
-def test_anonymize_gt1_name(gt1_parsed):
-    original = _field(_seg(gt1_parsed, "GT1"), 3).value
-    anon = anonymize_message(gt1_parsed)
-    assert _field(_seg(anon, "GT1"), 3).value != original
-
-
-def test_anonymize_gt1_address(gt1_parsed):
-    original = _field(_seg(gt1_parsed, "GT1"), 5).raw_value
+@pytest.mark.parametrize("field_num, attr", [
+    (3, "value"),       # name
+    (5, "raw_value"),   # address
+    (6, "raw_value"),   # home phone
+    (7, "raw_value"),   # business phone
+])
+def test_anonymize_gt1_field(gt1_parsed, field_num, attr):
+    original = getattr(_field(_seg(gt1_parsed, "GT1"), field_num), attr)
     anon = anonymize_message(gt1_parsed)
-    assert _field(_seg(anon, "GT1"), 5).raw_value != original
-
-
-def test_anonymize_gt1_phone_home(gt1_parsed):
-    original = _field(_seg(gt1_parsed, "GT1"), 6).raw_value
-    anon = anonymize_message(gt1_parsed)
-    assert _field(_seg(anon, "GT1"), 6).raw_value != original
-
-
-def test_anonymize_gt1_phone_business(gt1_parsed):
-    original = _field(_seg(gt1_parsed, "GT1"), 7).raw_value
-    anon = anonymize_message(gt1_parsed)
-    assert _field(_seg(anon, "GT1"), 7).raw_value != original
+    assert getattr(_field(_seg(anon, "GT1"), field_num), attr) != original
 
 
 def test_anonymize_gt1_dob(gt1_parsed):
@@ -195,7 +191,7 @@ def test_anonymize_gt1_dob(gt1_parsed):
 # IN1 tests — inline fixture
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def in1_parsed():
     msg = (
         "MSH|^~\\&|SYS|HOSP|RCV|HOSP|20260101120000||ADT^A01|1|P|2.5\r"
@@ -206,29 +202,22 @@ def in1_parsed():
     return parse_hl7(msg)
 
 
-def test_anonymize_in1_name(in1_parsed):
-    original = _field(_seg(in1_parsed, "IN1"), 16).value
+@pytest.mark.parametrize("field_num, attr", [
+    (16, "value"),      # name
+    (18, "raw_value"),  # date of birth
+    (19, "raw_value"),  # address
+])
+def test_anonymize_in1_field(in1_parsed, field_num, attr):
+    original = getattr(_field(_seg(in1_parsed, "IN1"), field_num), attr)
     anon = anonymize_message(in1_parsed)
-    assert _field(_seg(anon, "IN1"), 16).value != original
-
-
-def test_anonymize_in1_dob(in1_parsed):
-    original = _field(_seg(in1_parsed, "IN1"), 18).raw_value
-    anon = anonymize_message(in1_parsed)
-    assert _field(_seg(anon, "IN1"), 18).raw_value != original
-
-
-def test_anonymize_in1_address(in1_parsed):
-    original = _field(_seg(in1_parsed, "IN1"), 19).raw_value
-    anon = anonymize_message(in1_parsed)
-    assert _field(_seg(anon, "IN1"), 19).raw_value != original
+    assert getattr(_field(_seg(anon, "IN1"), field_num), attr) != original
 
 
 # ---------------------------------------------------------------------------
 # MRG tests — inline fixture
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mrg_parsed():
     msg = (
         "MSH|^~\\&|SYS|HOSP|RCV|HOSP|20260101120000||ADT^A34|1|P|2.5\r"
@@ -238,13 +227,11 @@ def mrg_parsed():
     return parse_hl7(msg)
 
 
-def test_anonymize_mrg_prior_ids(mrg_parsed):
-    original_1 = _field(_seg(mrg_parsed, "MRG"), 1).raw_value
-    anon = anonymize_message(mrg_parsed)
-    assert _field(_seg(anon, "MRG"), 1).raw_value != original_1
-
-
-def test_anonymize_mrg_prior_name(mrg_parsed):
-    original = _field(_seg(mrg_parsed, "MRG"), 7).value
+@pytest.mark.parametrize("field_num, attr", [
+    (1, "raw_value"),   # prior patient ID
+    (7, "value"),       # prior name
+])
+def test_anonymize_mrg_field(mrg_parsed, field_num, attr):
+    original = getattr(_field(_seg(mrg_parsed, "MRG"), field_num), attr)
     anon = anonymize_message(mrg_parsed)
-    assert _field(_seg(anon, "MRG"), 7).value != original
+    assert getattr(_field(_seg(anon, "MRG"), field_num), attr) != original
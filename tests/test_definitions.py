@@ -1,6 +1,6 @@
 """Tests for hl7view.definitions: resolve_version, get_seg_def, get_field_def, data consistency."""
 
-from hl7view.definitions import resolve_version, get_seg_def, get_field_def, HL7_V25, HL7_V28
+from hl7view.definitions import resolve_version, get_seg_def, get_field_def, get_field_defs, HL7_V25, HL7_V28
 
 
 def test_resolve_version_25():
@@ -14,6 +14,14 @@ def test_resolve_version_23():
     assert resolve_version("2.4") == "2.3"
 
 
+def test_resolve_version_newer():
+    assert resolve_version("2.8") == "2.8"
+    assert resolve_version("2.8.2") == "2.8"
+    assert resolve_version("2.6") == "2.5"
+    assert resolve_version("2.7.1") == "2.5"
+    assert resolve_version(" 2.3.1 ") == "2.3"
+
+
 def test_resolve_version_default():
     assert resolve_version(None) == "2.5"
     assert resolve_version("") == "2.5"
@@ -37,6 +45,13 @@ def test_get_field_def():
     assert fld["dt"] == "XPN"
 
 
+def test_get_field_defs_indexed_by_field_num():
+    defs = get_field_defs("PID", "2.5")
+    assert defs[0] is None
+    assert defs[5] is get_field_def("PID", 5, "2.5")
+    assert get_field_defs("ZZZ", "2.5") == ()
+
+
 # --- v2.8 definitions ---
 
 def test_resolve_version_28():
@@ -109,19 +124,18 @@ def test_new_segments_v25():
         "FT1": 31, "PR1": 20, "PD1": 21, "IN2": 72,
         "ROL": 12, "DB1": 8, "ACC": 11,
     }
-    for seg_name, field_count in expected.items():
-        seg = get_seg_def(seg_name, "2.5")
-        assert seg is not None, f"{seg_name} missing from v2.5"
-        assert len(seg["fields"]) == field_count, (
-            f"{seg_name} expected {field_count} fields, got {len(seg['fields'])}")
+    # Missing segments show up as None in the diff
+    actual = {name: len(seg["fields"]) if (seg := get_seg_def(name, "2.5")) else None
+              for name in expected}
+    assert actual == expected
 
 
 def test_new_segments_v28():
-    """All 11 new segments also exist in v2.8 (inherited via deepcopy)."""
-    for seg_name in ["RXA", "RXE", "RXO", "RXR", "FT1", "PR1",
-                     "PD1", "IN2", "ROL", "DB1", "ACC"]:
-        seg = get_seg_def(seg_name, "2.8")
-        assert seg is not None, f"{seg_name} missing from v2.8"
+    """All 11 new segments also exist in v2.8 (inherited from v2.5)."""
+    missing = [seg_name for seg_name in ["RXA", "RXE", "RXO", "RXR", "FT1", "PR1",
+                                         "PD1", "IN2", "ROL", "DB1", "ACC"]
+               if get_seg_def(seg_name, "2.8") is None]
+    assert missing == []
 
 
 def test_new_segments_ce_to_cwe_v28():
@@ -1,10 +1,16 @@
-"""Tests for hl7view.diff — field-level message comparison."""
+"""Tests for hl7view.diff — field-level message comparison.
+
+The parsed sample fixtures are shared across the session: never modify
+them in place. The helpers below return new messages instead.
+"""
 
 import copy
 
 import pytest
 
-from hl7view.parser import parse_hl7, reparse_field, rebuild_raw_line
+from hl7view.parser import (
+    ParsedMessage, Segment, parse_hl7, reparse_field, rebuild_raw_line,
+)
 from hl7view.diff import diff_messages, FieldDiff, SegmentDiff, MessageDiff
 
 
@@ -12,34 +18,41 @@ from hl7view.diff import diff_messages, FieldDiff, SegmentDiff, MessageDiff
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _with_segments(parsed, segments):
+    """New ParsedMessage with parsed's metadata over the given segments."""
+    msg = ParsedMessage(segments=segments, version=parsed.version,
+                        message_type=parsed.message_type,
+                        declared_charset=parsed.declared_charset)
+    for seg in segments:
+        msg.segments_by_name.setdefault(seg.name, []).append(seg)
+    return msg
+
+
 def _modify_field(parsed, seg_name, field_num, new_value, rep_index=1):
-    """Modify a field in a parsed message (returns a deep copy)."""
-    msg = copy.deepcopy(parsed)
-    for seg in msg.segments:
+    """Copy of parsed with one field changed.
+
+    Only the modified segment and field are new objects; the rest is shared
+    with parsed, which is left untouched.
+    """
+    segments = list(parsed.segments)
+    for i, seg in enumerate(segments):
         if seg.name == seg_name and seg.rep_index == rep_index:
-            for fld in seg.fields:
-                if fld.field_num == field_num:
-                    reparse_field(fld, new_value)
-                    seg.raw_line = rebuild_raw_line(seg.name, seg.fields)
-                    return msg
+            fld = seg.fields_by_num.get(field_num)
+            if fld is None:
+                break
+            new_fld = copy.copy(fld)
+            reparse_field(new_fld, new_value)  # assigns new lists, shares nothing
+            fields = [new_fld if f is fld else f for f in seg.fields]
+            segments[i] = Segment(seg.name, seg.rep_index, fields,
+                                  rebuild_raw_line(seg.name, fields))
+            return _with_segments(parsed, segments)
     raise ValueError(f"Field {seg_name}-{field_num} not found")
 
 
 def _remove_segment(parsed, seg_name, rep_index=1):
-    """Remove a segment from a parsed message (returns a deep copy)."""
-    msg = copy.deepcopy(parsed)
-    msg.segments = [s for s in msg.segments
-                    if not (s.name == seg_name and s.rep_index == rep_index)]
-    return msg
-
-
-def _diff_statuses(diff_result):
-    """Extract flat list of (address, status) from a MessageDiff."""
-    result = []
-    for sd in diff_result.segment_diffs:
-        for fd in sd.field_diffs:
-            result.append((fd.address, fd.status))
-    return result
+    """Copy of parsed without one segment (remaining segments are shared)."""
+    return _with_segments(parsed, [s for s in parsed.segments
+                                   if not (s.name == seg_name and s.rep_index == rep_index)])
 
 
 def _changed_fields(diff_result):
@@ -52,28 +65,51 @@ def _changed_fields(diff_result):
 # Tests: identical messages
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def adt_parsed_b(adt_raw):
+    """Second, independent parse of the ADT sample (equal, not identical)."""
+    return parse_hl7(adt_raw)
+
+
+@pytest.fixture(scope="module")
+def oru_parsed_b(oru_raw):
+    """Second, independent parse of the ORU sample (equal, not identical)."""
+    return parse_hl7(oru_raw)
+
+
+@pytest.fixture(scope="module")
+def oru_without_obx5(oru_parsed):
+    """The ORU sample minus OBX[5], shared by both diff directions."""
+    return _remove_segment(oru_parsed, 'OBX', rep_index=5)
+
+
 class TestIdenticalMessages:
 
-    def test_identical_adt(self, adt_parsed):
-        result = diff_messages(adt_parsed, copy.deepcopy(adt_parsed))
+    def test_identical_adt(self, adt_parsed, adt_parsed_b):
+        result = diff_messages(adt_parsed, adt_parsed_b)
         assert result.summary['modified'] == 0
         assert result.summary['a_only'] == 0
         assert result.summary['b_only'] == 0
         assert result.summary['identical'] == result.summary['total_fields']
 
-    def test_identical_oru(self, oru_parsed):
-        result = diff_messages(oru_parsed, copy.deepcopy(oru_parsed))
+    def test_identical_oru(self, oru_parsed, oru_parsed_b):
+        result = diff_messages(oru_parsed, oru_parsed_b)
         assert result.summary['modified'] == 0
         assert result.summary['a_only'] == 0
         assert result.summary['b_only'] == 0
 
-    def test_all_segment_diffs_identical(self, adt_parsed):
-        result = diff_messages(adt_parsed, copy.deepcopy(adt_parsed))
+    def test_all_segment_diffs_identical(self, adt_parsed, adt_parsed_b):
+        result = diff_messages(adt_parsed, adt_parsed_b)
         for sd in result.segment_diffs:
             assert sd.status == 'identical'
 
-    def test_metadata_preserved(self, adt_parsed):
-        result = diff_messages(adt_parsed, copy.deepcopy(adt_parsed))
+    def test_same_object_matches_equal_copy(self, oru_parsed, oru_parsed_b):
+        # Diffing a message against itself takes the shared-segment path
+        assert (diff_messages(oru_parsed, oru_parsed)
+                == diff_messages(oru_parsed, oru_parsed_b))
+
+    def test_metadata_preserved(self, adt_parsed, adt_parsed_b):
+        result = diff_messages(adt_parsed, adt_parsed_b)
         assert result.version_a == '2.5'
         assert result.version_b == '2.5'
         assert result.type_a == 'ADT^A01'
@@ -138,7 +174,7 @@ class TestSegmentAddRemove:
         msg_b = _remove_segment(adt_parsed, 'NK1')
         result = diff_messages(adt_parsed, msg_b)
         # NK1 has fields — they should all be a_only
-        nk1_seg = [s for s in adt_parsed.segments if s.name == 'NK1'][0]
+        nk1_seg = adt_parsed.segments_by_name['NK1'][0]
         assert result.summary['a_only'] == len(nk1_seg.fields)
 
     def test_removed_evn_segment(self, adt_parsed):
@@ -154,23 +190,21 @@ class TestSegmentAddRemove:
 
 class TestDifferentOBXCounts:
 
-    def test_oru_fewer_obx_in_b(self, oru_parsed):
-        """Remove OBX[5] from B — should show as a_only."""
-        msg_b = _remove_segment(oru_parsed, 'OBX', rep_index=5)
-        result = diff_messages(oru_parsed, msg_b)
-        obx5_diffs = [sd for sd in result.segment_diffs
-                      if sd.name == 'OBX' and sd.rep_index == 5]
-        assert len(obx5_diffs) == 1
-        assert obx5_diffs[0].status == 'a_only'
-
-    def test_oru_extra_obx_in_b(self, oru_parsed):
-        """Remove OBX[5] from A — should show as b_only."""
-        msg_a = _remove_segment(oru_parsed, 'OBX', rep_index=5)
-        result = diff_messages(msg_a, oru_parsed)
+    @pytest.mark.parametrize("removed_from, expected_status", [
+        ('b', 'a_only'),  # fewer OBX in B
+        ('a', 'b_only'),  # extra OBX in B
+    ])
+    def test_oru_obx5_only_on_one_side(self, oru_parsed, oru_without_obx5,
+                                       removed_from, expected_status):
+        """OBX[5] missing from one side shows as a_only / b_only."""
+        if removed_from == 'b':
+            result = diff_messages(oru_parsed, oru_without_obx5)
+        else:
+            result = diff_messages(oru_without_obx5, oru_parsed)
         obx5_diffs = [sd for sd in result.segment_diffs
                       if sd.name == 'OBX' and sd.rep_index == 5]
         assert len(obx5_diffs) == 1
-        assert obx5_diffs[0].status == 'b_only'
+        assert obx5_diffs[0].status == expected_status
 
     def test_modified_obx_value(self, oru_parsed):
         """Modify OBX[1]-5 (glucose value) and check diff."""
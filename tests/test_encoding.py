@@ -45,3 +45,11 @@ def test_orm_sample_encoding():
     # ORM file on disk is UTF-8 (MSH-18 declares "8859/1" but the bytes are valid UTF-8)
     assert result["encoding"] == "UTF-8"
     assert result["has_high_bytes"] is True
+
+
+def test_detect_utf8_lenient_sequences():
+    # Structurally valid but rejected by the strict codec (encoded surrogate)
+    raw = b"MSH|^~\\&|TEST|\xed\xa0\x80"
+    result = detect_encoding(raw)
+    assert result["encoding"] == "UTF-8"
+    assert result["has_high_bytes"] is True
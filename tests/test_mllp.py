@@ -0,0 +1,216 @@
+"""Tests for hl7view.mllp against a scripted loopback server."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from hl7view.mllp import MllpClient, MllpClientPool, mllp_send
+
+
+def _frame(payload):
+    return b"\x0b" + payload + b"\x1c\r"
+
+
+def _ack_each(conn):
+    """Reply "ACK <payload>" to every message on the connection."""
+    for payload in _frames(conn):
+        conn.sendall(_frame(b"ACK " + payload))
+
+
+def _frames(conn):
+    """Yield MLLP payloads received on conn until the client disconnects."""
+    buf = b""
+    while True:
+        while b"\x1c" not in buf:
+            try:
+                chunk = conn.recv(4096)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buf += chunk
+        payload, _, buf = buf.partition(b"\x1c")
+        buf = buf.lstrip(b"\r")
+        yield payload.lstrip(b"\x0b")
+
+
+@pytest.fixture
+def mllp_server():
+    """Start loopback servers; each accepted connection runs handler(conn).
+
+    Returns (port, accepted), where accepted counts connections so far.
+    """
+    servers = []
+
+    def start(handler):
+        srv = socket.create_server(("127.0.0.1", 0))
+        accepted = []
+
+        def accept_loop():
+            while True:
+                try:
+                    conn, _ = srv.accept()
+                except OSError:
+                    return
+                accepted.append(conn)
+                threading.Thread(target=_run, args=(conn,), daemon=True).start()
+
+        def _run(conn):
+            with conn:
+                try:
+                    handler(conn)
+                except OSError:
+                    pass
+
+        threading.Thread(target=accept_loop, daemon=True).start()
+        servers.append(srv)
+        return srv.getsockname()[1], accepted
+
+    yield start
+    for srv in servers:
+        srv.close()
+
+
+def test_response_split_across_reads(mllp_server):
+    def handler(conn):
+        next(_frames(conn))
+        for part in (b"\x0bMSA|A", b"A|MSG1", b"\x1c", b"\r"):
+            conn.sendall(part)
+            time.sleep(0.05)
+
+    port, _ = mllp_server(handler)
+    response, _ = mllp_send("127.0.0.1", port, "MSH|MSG1", timeout=5)
+    assert response == "MSA|AA|MSG1"
+
+
+def test_timeout_is_an_overall_deadline(mllp_server):
+    # A peer that trickles bytes but never sends FS must not keep the
+    # client waiting one full timeout per read
+    def handler(conn):
+        next(_frames(conn))
+        conn.sendall(b"\x0b")
+        for _ in range(50):
+            conn.sendall(b"M")
+            time.sleep(0.1)
+
+    port, _ = mllp_server(handler)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        mllp_send("127.0.0.1", port, "MSH|MSG1", timeout=0.5)
+    assert time.monotonic() - start < 2.0
+
+
+def test_client_reuses_connection(mllp_server):
+    port, accepted = mllp_server(_ack_each)
+    with MllpClient("127.0.0.1", port, timeout=5) as client:
+        assert client.send("MSG1")[0] == "ACK MSG1"
+        assert client.send("MSG2")[0] == "ACK MSG2"
+    assert len(accepted) == 1
+
+
+def test_client_reconnects_after_peer_closes(mllp_server):
+    def handler(conn):
+        payload = next(_frames(conn))
+        conn.sendall(_frame(b"ACK " + payload))
+
+    port, accepted = mllp_server(handler)
+    with MllpClient("127.0.0.1", port, timeout=5) as client:
+        assert client.send("MSG1")[0] == "ACK MSG1"
+        # Let the server's close reach the client before the next send
+        time.sleep(0.1)
+        assert client.send("MSG2")[0] == "ACK MSG2"
+    assert len(accepted) == 2
+
+
+def test_bytes_after_fs_carry_over_to_next_response(mllp_server):
+    # Both replies arrive in one write; the reply owed to the no-wait send
+    # is skipped and the rest of the buffer answers the second send
+    def handler(conn):
+        frames = _frames(conn)
+        first, second = next(frames), next(frames)
+        conn.sendall(_frame(b"ACK " + first) + _frame(b"ACK " + second))
+        for _ in frames:
+            pass
+
+    port, _ = mllp_server(handler)
+    with MllpClient("127.0.0.1", port, timeout=5) as client:
+        assert client.send("MSG1", wait_for_ack=False)[0] is None
+        assert client.send("MSG2")[0] == "ACK MSG2"
+
+
+def test_late_ack_is_not_taken_as_next_reply(mllp_server):
+    port, _ = mllp_server(_ack_each)
+    with MllpClient("127.0.0.1", port, timeout=5) as client:
+        client.send("MSG1", wait_for_ack=False)
+        # The ACK for MSG1 is already waiting when MSG2 goes out
+        time.sleep(0.1)
+        assert client.send("MSG2")[0] == "ACK MSG2"
+        assert client.send("MSG3")[0] == "ACK MSG3"
+
+
+def test_unsolicited_frame_is_dropped(mllp_server):
+    def handler(conn):
+        for payload in _frames(conn):
+            conn.sendall(_frame(b"ACK " + payload) + _frame(b"EXTRA"))
+
+    port, _ = mllp_server(handler)
+    with MllpClient("127.0.0.1", port, timeout=5) as client:
+        assert client.send("MSG1")[0] == "ACK MSG1"
+        time.sleep(0.1)
+        assert client.send("MSG2")[0] == "ACK MSG2"
+
+
+def test_eof_before_fs_returns_partial_response(mllp_server):
+    def handler(conn):
+        next(_frames(conn))
+        conn.sendall(b"\x0bMSA|AA|MSG1")
+
+    port, accepted = mllp_server(handler)
+    with MllpClient("127.0.0.1", port, timeout=5) as client:
+        assert client.send("MSG1")[0] == "MSA|AA|MSG1"
+        assert client.send("MSG2")[0] == "MSA|AA|MSG1"
+    assert len(accepted) == 2
+
+
+def test_pool_keeps_one_client_per_target(mllp_server):
+    port, accepted = mllp_server(_ack_each)
+    pool = MllpClientPool()
+    try:
+        assert pool.send("127.0.0.1", port, "MSG1", timeout=5)[0] == "ACK MSG1"
+        assert pool.send("127.0.0.1", port, "MSG2", timeout=5)[0] == "ACK MSG2"
+    finally:
+        pool.close()
+    assert len(accepted) == 1
+
+
+def test_pool_reconnects_after_idle_timeout(mllp_server):
+    # A silently dropped connection still looks open, so an idle client is
+    # replaced rather than probed
+    port, accepted = mllp_server(_ack_each)
+    pool = MllpClientPool(idle_timeout=0.1)
+    try:
+        assert pool.send("127.0.0.1", port, "MSG1", timeout=5)[0] == "ACK MSG1"
+        assert pool.send("127.0.0.1", port, "MSG2", timeout=5)[0] == "ACK MSG2"
+        assert len(accepted) == 1
+        time.sleep(0.2)
+        assert pool.send("127.0.0.1", port, "MSG3", timeout=5)[0] == "ACK MSG3"
+    finally:
+        pool.close()
+    assert len(accepted) == 2
+
+
+def test_pool_evicts_least_recently_used(mllp_server):
+    port_a, accepted_a = mllp_server(_ack_each)
+    port_b, accepted_b = mllp_server(_ack_each)
+    pool = MllpClientPool(max_clients=1)
+    try:
+        pool.send("127.0.0.1", port_a, "MSG1", timeout=5)
+        pool.send("127.0.0.1", port_b, "MSG2", timeout=5)
+        assert len(pool._clients) == 1
+        assert pool.send("127.0.0.1", port_a, "MSG3", timeout=5)[0] == "ACK MSG3"
+    finally:
+        pool.close()
+    assert len(accepted_a) == 2
+    assert len(accepted_b) == 1
@@ -1,11 +1,14 @@
 """Tests for hl7view.parser: parse_hl7, MSH numbering, components, repetitions, reparse/rebuild."""
 
-from hl7view.parser import parse_hl7, reparse_field, rebuild_raw_line
+from hl7view.parser import (
+    parse_hl7, reparse_field, replace_component, rebuild_raw_line,
+    normalize_message, parse_segments, split_segments,
+)
 
 
 def _field(seg, num):
     """Get field by field_num from a segment."""
-    return next(f for f in seg.fields if f.field_num == num)
+    return seg.fields_by_num[num]
 
 
 # --- Structure ---
@@ -28,7 +31,7 @@ def test_parse_orm_structure(orm_parsed):
 def test_parse_oru_structure(oru_parsed):
     # MSH, PID, PV1, ORC, OBR, OBX×5, NTE = 11
     assert len(oru_parsed.segments) == 11
-    obx_segs = [s for s in oru_parsed.segments if s.name == "OBX"]
+    obx_segs = oru_parsed.segments_by_name["OBX"]
     assert len(obx_segs) == 5
     assert oru_parsed.message_type == "ORU^R01"
 
@@ -56,16 +59,16 @@ def test_msh_field_numbering(adt_parsed):
 
 # --- PID field values ---
 
-def test_pid_field_values(adt_parsed):
-    pid = next(s for s in adt_parsed.segments if s.name == "PID")
+def test_pid_field_values(adt_pid):
+    pid = adt_pid
     assert "PAT78432" in _field(pid, 3).value
     assert "Tamm" in _field(pid, 5).value
 
 
 # --- Components ---
 
-def test_component_splitting(adt_parsed):
-    pid = next(s for s in adt_parsed.segments if s.name == "PID")
+def test_component_splitting(adt_pid):
+    pid = adt_pid
     pid5 = _field(pid, 5)
     assert len(pid5.components) >= 3
     assert pid5.components[0].value == "Tamm"       # family name
@@ -77,7 +80,7 @@ def test_subcomponent_splitting():
     """Synthetic field with & subcomponents."""
     raw = "MSH|^~\\&|A|B|C|D|20260101||ADT^A01|1|P|2.5\rPID|1||123^^^AUTH&1.2.3&ISO^PI"
     parsed = parse_hl7(raw)
-    pid = next(s for s in parsed.segments if s.name == "PID")
+    pid = parsed.segments_by_name["PID"][0]
     pid3 = _field(pid, 3)
     # Component 4 is "AUTH&1.2.3&ISO" — should have subcomponents
     comp4 = pid3.components[3]
@@ -89,8 +92,8 @@ def test_subcomponent_splitting():
 
 # --- Repetitions ---
 
-def test_repetition_splitting(adt_parsed):
-    pid = next(s for s in adt_parsed.segments if s.name == "PID")
+def test_repetition_splitting(adt_pid):
+    pid = adt_pid
     pid13 = _field(pid, 13)
     assert len(pid13.repetitions) == 2
     assert "+37255500123" in pid13.repetitions[0].value
@@ -112,6 +115,13 @@ def test_repeated_segments(oru_parsed):
     assert [s.rep_index for s in obx_segs] == [1, 2, 3, 4, 5]
 
 
+def test_segments_by_name(oru_parsed):
+    assert oru_parsed.segments_by_name["OBX"] == [
+        s for s in oru_parsed.segments if s.name == "OBX"]
+    assert oru_parsed.segments_by_name["MSH"][0] is oru_parsed.segments[0]
+    assert "ZZZ" not in oru_parsed.segments_by_name
+
+
 # --- Edge cases ---
 
 def test_parse_empty_returns_none():
@@ -129,8 +139,9 @@ def test_parse_garbage_returns_minimal():
 
 # --- Reparse / rebuild ---
 
-def test_reparse_field(adt_parsed):
-    pid = next(s for s in adt_parsed.segments if s.name == "PID")
+def test_reparse_field(adt_raw):
+    parsed = parse_hl7(adt_raw)
+    pid = parsed.segments_by_name["PID"][0]
     pid5 = _field(pid, 5)
     reparse_field(pid5, "NEW^VALUE^MID")
     assert pid5.value == "NEW^VALUE^MID"
@@ -140,8 +151,29 @@ def test_reparse_field(adt_parsed):
     assert pid5.components[2].value == "MID"
 
 
-def test_rebuild_raw_line(adt_parsed):
-    pid = next(s for s in adt_parsed.segments if s.name == "PID")
+def test_replace_component_keeps_other_repetitions():
+    parsed = parse_hl7("MSH|^~\\&|A|B|C|D|20260101||ADT^A01|1|P|2.5\rPID|1||1^^^X~2^^^Y")
+    pid3 = _field(parsed.segments[1], 3)
+    second = pid3.repetitions[1]
+    replace_component(pid3, 4, "Z&Q")
+    assert pid3.raw_value == "1^^^Z&Q~2^^^Y"
+    assert pid3.value == "1^^^Z&Q"
+    assert pid3.components[3].subcomponents == ["Z", "Q"]
+    assert pid3.repetitions[0].components is pid3.components
+    assert pid3.repetitions[1] is second
+
+
+def test_replace_component_adding_repetition():
+    parsed = parse_hl7("MSH|^~\\&|A|B|C|D|20260101||ADT^A01|1|P|2.5\rPID|1||1^A")
+    pid3 = _field(parsed.segments[1], 3)
+    replace_component(pid3, 2, "B~C")
+    assert pid3.raw_value == "1^B~C"
+    assert len(pid3.repetitions) == 2
+
+
+def test_rebuild_raw_line(adt_raw):
+    parsed = parse_hl7(adt_raw)
+    pid = parsed.segments_by_name["PID"][0]
     pid5 = _field(pid, 5)
     reparse_field(pid5, "DOE^JANE")
     rebuilt = rebuild_raw_line("PID", pid.fields)
@@ -149,6 +181,27 @@ def test_rebuild_raw_line(adt_parsed):
     assert "DOE^JANE" in rebuilt
 
 
+# --- Batch splitting ---
+
+def test_split_segments():
+    raw = ("FHS|^~\\&|A\rBHS|^~\\&|A\r"
+           "MSH|^~\\&|A|B|C|D|20260101||ADT^A01|1|P|2.5\rPID|1||111\r"
+           "MSH|^~\\&|A|B|C|D|20260101||ADT^A08|2|P|2.5\rPID|1||222\rNTE|1\r"
+           "BTS|2\rFTS|1")
+    msgs = split_segments(normalize_message(raw))
+    assert len(msgs) == 2
+    assert [s.name for s in parse_segments(msgs[1]).segments] == ["MSH", "PID", "NTE"]
+    assert parse_segments(msgs[0]).message_type == "ADT^A01"
+
+
+def test_split_segments_single_message():
+    lines = normalize_message("\x0bMSH|^~\\&|A\r\nPID|1\x1c\r")
+    assert split_segments(lines) == [["MSH|^~\\&|A", "PID|1"]]
+    assert [s.name for s in parse_segments(lines).segments] == ["MSH", "PID"]
+    assert split_segments(normalize_message("PID|1")) == []
+    assert parse_segments([]) is None
+
+
 # --- Normalization ---
 
 def test_normalize_mixed_line_endings():
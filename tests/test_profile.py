@@ -1,5 +1,7 @@
 """Tests for hl7view.profile: load_profile, get_profile_*, validation counts."""
 
+import json
+
 from hl7view.profile import (
     load_profile,
     get_profile_segment,
@@ -42,6 +44,42 @@ def test_profile_none_safe():
     assert get_profile_component(None, "MSH", 3, 1) is None
 
 
+def test_profile_unflattened_dict():
+    """Profiles built in memory (not via load_profile) still resolve."""
+    profile = {"name": "inline", "segments": {"PID": {"fields": {
+        "3": {"customName": "MRN", "components": {"1": {"description": "ID"}}},
+    }}}}
+    assert get_profile_field(profile, "PID", 3)["customName"] == "MRN"
+    assert get_profile_component(profile, "PID", 3, 1)["description"] == "ID"
+    assert get_profile_field(profile, "PID", 4) is None
+
+
+def test_profile_non_numeric_keys(tmp_path, adt_parsed):
+    """Comment/blank keys are ignored instead of rejecting the profile."""
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"name": "commented", "segments": {"PID": {"fields": {
+        "_comment": "site-specific overrides",
+        "": {"customName": "blank"},
+        "5a": {"customName": "typo"},
+        "05": {"customName": "padded"},
+        "+7": {"customName": "signed"},
+        "\u0668": {"customName": "arabic-indic eight"},
+        "3": {"customName": "MRN", "components": {
+            "_comment": "CX", "01": {"description": "padded"},
+            "1": {"description": "ID"},
+        }},
+    }}}}))
+    profile = load_profile(path)
+    assert get_profile_field(profile, "PID", 3)["customName"] == "MRN"
+    assert get_profile_component(profile, "PID", 3, 1)["description"] == "ID"
+    # Same answers as the unflattened string-key lookup
+    raw = json.loads(path.read_text())
+    for num in (3, 5, 7, 8):
+        assert get_profile_field(profile, "PID", num) == get_profile_field(raw, "PID", num)
+    assert get_profile_field(profile, "PID", 5) is None
+    _profile_validation_counts(adt_parsed, profile)
+
+
 def test_validation_counts_no_profile(adt_parsed):
     req, mis, missing, unexpected = _profile_validation_counts(adt_parsed, None)
     assert req == 0
@@ -9,8 +9,10 @@ hl7-viewer.html between @@GENERATED_DEFS_START@@ / @@GENERATED_DEFS_END@@
 marker comments.
 """
 
+import functools
 import json
 import os
+import re
 import sys
 
 # Add project root to path so we can import hl7view
@@ -24,9 +26,19 @@ END_MARKER = "// @@GENERATED_DEFS_END@@"
 
 HTML_FILE = os.path.join(PROJECT_ROOT, "hl7-viewer.html")
 
+# Characters json.dumps escapes within ASCII
+_JSON_ESCAPE_RE = re.compile(r'["\\\x00-\x1f\x7f]')
 
+
+@functools.lru_cache(maxsize=4096)
 def _js_str(s):
-    """Quote a string for JS, using double quotes only when needed."""
+    """Quote a string for JS, using double quotes only when needed.
+
+    Cached: names and dt/opt codes repeat across segments and versions.
+    """
+    # Plain ASCII without quotes, backslashes or control chars needs no escaping
+    if s.isascii() and _JSON_ESCAPE_RE.search(s) is None:
+        return '"' + s + '"'
     # Use json.dumps for correct escaping (handles quotes, backslashes, etc.)
     return json.dumps(s)
 
@@ -38,10 +50,10 @@ def _format_data_types(data_types):
         if dt_def.get("primitive"):
             lines.append(f'{dt_name}:{{name:{_js_str(dt_def["name"])},primitive:true}},')
         else:
-            comps = ",".join(
+            comps = ",".join([
                 f'{{name:{_js_str(c["name"])},dt:{_js_str(c["dt"])}}}'
                 for c in dt_def["components"]
-            )
+            ])
             lines.append(f'{dt_name}:{{name:{_js_str(dt_def["name"])},components:[')
             lines.append(f"{comps}]}},")
     lines.append("};")
@@ -76,7 +88,7 @@ def _format_segment_defs(var_name, seg_defs):
 
 def _format_msh18(msh18):
     """Format MSH18_TO_ENCODING as compact JS."""
-    entries = ",".join(f"{_js_str(k)}:{_js_str(v)}" for k, v in msh18.items())
+    entries = ",".join([f"{_js_str(k)}:{_js_str(v)}" for k, v in msh18.items()])
     return f"const MSH18_TO_ENCODING = {{{entries}}};"
 
 
@@ -131,6 +143,11 @@ def update_html(html_path=None):
         + content[end_idx:]
     )
 
+    # Definitions unchanged: leave the file (and its mtime) alone
+    if new_content == content:
+        print(f"{os.path.basename(path)} already up to date")
+        return
+
     with open(path, "w", encoding="utf-8") as f:
         f.write(new_content)
 